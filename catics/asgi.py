@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'catics.settings')
 
-application = get_asgi_application()
+# the apps have to be loaded before importing the consumers
+django_application = get_asgi_application()
+
+from channels.routing import ProtocolTypeRouter, URLRouter
+from catics_auth.middleware import TokenAuthMiddleware
+from catics_core.routing import websocket_urlpatterns
+
+application = ProtocolTypeRouter({
+    'http': django_application,
+    'websocket': TokenAuthMiddleware(URLRouter(websocket_urlpatterns)),
+})
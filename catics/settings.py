@@ -36,6 +36,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'catics_core.middleware.QueryStatsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -63,6 +64,19 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'catics.wsgi.application'
+ASGI_APPLICATION = 'catics.asgi.application'
+
+# the messages only reach the sockets of this process, when the moves are played by the gunicorn
+# processes and pushed by the daphne ones, share them through redis in settings_local.py:
+# CHANNEL_LAYERS = {
+#     'default': {
+#         'BACKEND': 'channels_redis.core.RedisChannelLayer',
+#         'CONFIG': { 'hosts': ['redis://127.0.0.1:6379/0'] },
+#     },
+# }
+CHANNEL_LAYERS = {
+    'default': { 'BACKEND': 'channels.layers.InMemoryChannelLayer' },
+}
 
 
 # Database
@@ -117,13 +131,49 @@ REST_KNOX = {
     'TOKEN_LIMIT_PER_USER': 5,
 }
 
+GAME_SNAPSHOT_INTERVAL = 16
+# number of requests kept by QueryStatsMiddleware
+REQUEST_STATS_SIZE = 10000
+GAME_WAIT_TIMEOUT = timedelta(seconds=30)
+# changes made by other processes are only seen by polling the database
+GAME_WAIT_POLL = timedelta(seconds=5)
+# requests waiting at once in a process, half of the threads of make run_prod
+GAME_WAIT_MAX_WAITERS = 8
 WASM_MAX_SIZE = 1024 * 1024 * 10
+WASM_FUEL = 100_000_000
+WASM_TIME_LIMIT = timedelta(seconds=1)
+WASM_MEMORY_MAX = 1024 * 1024 * 64
+WASM_POOL_SIZE = 4
+WASM_CACHE_SIZE = 32
+# games of the agents of an owner the matchmaking command plays at once
+MATCHMAKING_OWNER_LIMIT = 2
+# longer games between agents are left unfinished
+MATCHMAKING_MAX_PLIES = 500
+# Elo ratings, see catics_core.ratings
+RATING_INITIAL = 1500
+RATING_K = 32
+LEADERBOARD_MAX_SIZE = 100
 NAMES_MAX_SIZE = 200
 REGISTER_CHALLENGE_SIZE = 10
 REGISTER_CHALLENGE_EXPIRATION = timedelta(minutes=10)
+# one more zero (16 times more work) each time the challenges asked during the last
+# REGISTER_CHALLENGE_RATE_WINDOW, by an ip or by everyone, reach a limit
+REGISTER_CHALLENGE_DIFFICULTY = 5
+REGISTER_CHALLENGE_DIFFICULTY_MAX = 8
+REGISTER_CHALLENGE_RATE_WINDOW = timedelta(minutes=10)
+REGISTER_CHALLENGE_IP_LIMIT = 10
+REGISTER_CHALLENGE_GLOBAL_LIMIT = 100
+# behind a reverse proxy, the header of request.META it appends the client address to
+# (e.g. 'HTTP_X_FORWARDED_FOR'), otherwise REMOTE_ADDR is the client address
+REGISTER_CHALLENGE_IP_HEADER = None
 EMAIL_FROM = 'vulcain.dev@icloud.com'
 EMAIL_VALIDATION_SIZE = 10
 EMAIL_VALIDATION_SUBJECT = 'Catics - Validez votre adresse e-mail'
 EMAIL_VALIDATION_EXPIRATION = timedelta(minutes=10)
+# send_emails retries after EMAIL_RETRY_DELAY, then twice as long every time
+EMAIL_MAX_ATTEMPTS = 5
+EMAIL_RETRY_DELAY = timedelta(seconds=30)
+# a batch claimed by a worker of send_emails is left to it for this long
+EMAIL_CLAIM_DURATION = timedelta(minutes=5)
 
 from .settings_local import *
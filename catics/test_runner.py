@@ -5,4 +5,8 @@ from django.test.runner import DiscoverRunner
 class DetectableTestRunner(DiscoverRunner):
     def __init__(self, *args, **kwargs):
         settings.TEST_MODE = True
+        # even if settings_local.py shares them through redis, the tests run in a single process
+        settings.CHANNEL_LAYERS = {
+            'default': { 'BACKEND': 'channels.layers.InMemoryChannelLayer' },
+        }
         super(DetectableTestRunner, self).__init__(*args, **kwargs)
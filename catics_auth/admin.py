@@ -1,7 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import RegisterChallenge, Validation, CaticsUser
+from .models import RegisterChallenge, Validation, CaticsUser, OutgoingEmail
 
 admin.site.register(RegisterChallenge)
 admin.site.register(Validation)
+admin.site.register(OutgoingEmail)
 admin.site.register(CaticsUser, UserAdmin)
@@ -0,0 +1,85 @@
+from time import sleep
+from django.conf import settings
+from django.core import mail
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from ...models import OutgoingEmail
+
+class Command(BaseCommand):
+    help = 'Sends the queued emails in batches, over a single SMTP connection per batch, ' \
+        + 'and retries the failed ones later'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=5, help='seconds between two batches')
+        parser.add_argument('--once', action='store_true', help='send the queued emails then stop')
+
+    def handle(self, *args, **options):
+        while True:
+            n_sent = self.send_batch(options['batch_size'])
+            if n_sent == options['batch_size']:
+                # more are probably waiting
+                continue
+            if options['once']:
+                return
+            sleep(options['interval'])
+
+    def claim(self, batch_size: int) -> list[OutgoingEmail]:
+        '''
+        the emails of the next batch, their next attempt is pushed back by EMAIL_CLAIM_DURATION
+        so that the other workers skip them, they are retried then if this one stops meanwhile
+        '''
+        now = timezone.now()
+        claimed_until = now + settings.EMAIL_CLAIM_DURATION
+        with transaction.atomic():
+            ids = list(OutgoingEmail.objects.filter(
+                sent_at=None,
+                n_attempts__lt=settings.EMAIL_MAX_ATTEMPTS,
+                next_attempt_at__lte=now,
+            ).order_by('next_attempt_at').select_for_update(skip_locked=True).values_list('id', flat=True)[:batch_size])
+            # without row locks (sqlite), the rows claimed by another worker meanwhile are not due anymore
+            OutgoingEmail.objects.filter(id__in=ids, next_attempt_at__lte=now).update(next_attempt_at=claimed_until)
+        return list(OutgoingEmail.objects.filter(id__in=ids, next_attempt_at=claimed_until).order_by('id'))
+
+    def send_batch(self, batch_size: int) -> int:
+        '''
+        returns the number of emails of the batch, sent or not
+        '''
+        emails = self.claim(batch_size)
+        if len(emails) == 0:
+            return 0
+
+        n_sent = 0
+        connection = mail.get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            # the server is unreachable, the whole batch is retried later
+            for email in emails:
+                self.failed(email, e)
+        else:
+            for email in emails:
+                try:
+                    mail.EmailMessage(
+                        subject=email.subject,
+                        body=email.message,
+                        from_email=settings.EMAIL_FROM,
+                        to=[email.recipient],
+                        connection=connection,
+                    ).send()
+                except Exception as e:
+                    self.failed(email, e)
+                else:
+                    email.n_attempts += 1
+                    email.sent_at = timezone.now()
+                    n_sent += 1
+            connection.close()
+        OutgoingEmail.objects.bulk_update(emails, ['n_attempts', 'last_error', 'next_attempt_at', 'sent_at'])
+        self.stdout.write('{} emails sent, {} failed'.format(n_sent, len(emails) - n_sent))
+        return len(emails)
+
+    def failed(self, email: OutgoingEmail, error: Exception):
+        email.n_attempts += 1
+        email.last_error = repr(error)
+        email.next_attempt_at = timezone.now() + settings.EMAIL_RETRY_DELAY * 2 ** (email.n_attempts - 1)
@@ -0,0 +1,28 @@
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from knox.auth import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+@database_sync_to_async
+def get_user(token: bytes):
+    try:
+        (user, _) = TokenAuthentication().authenticate_credentials(token)
+    except AuthenticationFailed:
+        return AnonymousUser()
+    return user
+
+class TokenAuthMiddleware(BaseMiddleware):
+    '''
+    sets scope['user'] from the knox token of the "Authorization: Token ..." header
+    '''
+
+    async def __call__(self, scope, receive, send):
+        scope = dict(scope)
+        scope['user'] = AnonymousUser()
+        for (name, value) in scope.get('headers', []):
+            if name == b'authorization':
+                auth = value.split()
+                if len(auth) == 2 and auth[0].lower() == b'token':
+                    scope['user'] = await get_user(auth[1])
+        return await super().__call__(scope, receive, send)
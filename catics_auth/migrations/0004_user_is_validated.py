@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:18
+
+from django.db import migrations, models
+
+
+def copy_validations(apps, schema_editor):
+    User = apps.get_model('catics_auth', 'CaticsUser')
+    Validation = apps.get_model('catics_auth', 'Validation')
+    validated = Validation.objects.filter(is_validated=True).values('user_id')
+    User.objects.filter(id__in=validated).update(is_validated=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_auth', '0003_rename_registration_validation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='caticsuser',
+            name='is_validated',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(copy_validations, migrations.RunPython.noop),
+    ]
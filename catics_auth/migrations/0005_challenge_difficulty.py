@@ -0,0 +1,31 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_auth', '0004_user_is_validated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='registerchallenge',
+            name='difficulty',
+            field=models.PositiveSmallIntegerField(default=5),
+        ),
+        migrations.AddField(
+            model_name='registerchallenge',
+            name='ip',
+            field=models.GenericIPAddressField(null=True),
+        ),
+        migrations.AddIndex(
+            model_name='registerchallenge',
+            index=models.Index(fields=['created_at'], name='catics_auth_created_05e056_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='registerchallenge',
+            index=models.Index(fields=['ip', 'created_at'], name='catics_auth_ip_8bf26d_idx'),
+        ),
+    ]
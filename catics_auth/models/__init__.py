@@ -1,3 +1,4 @@
 from .user import CaticsUser
 from .validation import Validation
 from .register_challenge import RegisterChallenge
+from .outgoing_email import OutgoingEmail
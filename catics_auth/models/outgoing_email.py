@@ -0,0 +1,19 @@
+from django.db import models
+
+class OutgoingEmail(models.Model):
+    '''
+    An email waiting to be sent by the send_emails command, so requests never wait for SMTP
+    '''
+    class Meta:
+        indexes = [
+            models.Index(fields=['sent_at', 'next_attempt_at']),
+        ]
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    sent_at = models.DateTimeField(null=True, default=None)
+    n_attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(auto_now_add=True)
+    last_error = models.TextField(blank=True, default='')
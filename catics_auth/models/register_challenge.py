@@ -1,3 +1,4 @@
+import hashlib
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.conf import settings
@@ -5,9 +6,20 @@ from django.conf import settings
 User = get_user_model()
 
 class RegisterChallenge(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['ip', 'created_at']),
+        ]
+
     created_at = models.DateTimeField(auto_now_add=True)
     expire_at = models.DateTimeField()
     challenge = models.CharField(max_length=settings.REGISTER_CHALLENGE_SIZE)
     email = models.EmailField(unique=True)
+    ip = models.GenericIPAddressField(null=True)
+    # number of zeros the hexadecimal sha256 of challenge + answer must start with
+    difficulty = models.PositiveSmallIntegerField(default=settings.REGISTER_CHALLENGE_DIFFICULTY)
 
-
+    def is_solved_by(self, answer: str) -> bool:
+        digest = hashlib.sha256((self.challenge + answer).encode()).hexdigest()
+        return digest.startswith('0' * self.difficulty)
@@ -7,6 +7,8 @@ class CaticsUser(AbstractUser):
         db_table = "auth_user"
 
     email = models.EmailField(unique=True, blank=False, null=False)
+    # set by ValidateView, so IsValidated does not need to query Validation
+    is_validated = models.BooleanField(default=False)
     REQUIRED_FIELDS = ['email']
 
     def clean(self):
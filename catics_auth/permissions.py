@@ -1,5 +1,4 @@
 from rest_framework import permissions
-from .models import Validation
 
 class IsValidated(permissions.BasePermission):
     """
@@ -10,4 +9,4 @@ class IsValidated(permissions.BasePermission):
     code = 'unvalidated'
 
     def has_permission(self, request, view):
-        return Validation.objects.filter(user=request.user, is_validated=True).exists()
+        return request.user.is_authenticated and request.user.is_validated
@@ -37,6 +37,7 @@ class GetFromUsernameTestCase(APITestCase):
             validation_code='',
             is_validated=True,
         )
+        User.objects.filter(id=self.user.id).update(is_validated=True)
         response = self.client.post(
             reverse('auth-login'),
             { 'username': USERNAME, 'password': PASSWORD },
@@ -53,7 +54,7 @@ class GetFromUsernameTestCase(APITestCase):
         self.assertEqual(response.data['detail'].code, 'not_authenticated')
 
     def test_unvalidated(self):
-        Validation.objects.filter(user=self.user).update(is_validated=False)
+        User.objects.filter(id=self.user.id).update(is_validated=False)
         self.test_basic()
 
     def test_basic(self):
@@ -1,24 +1,27 @@
 import random
 import string
 import hashlib
+from io import StringIO
 from django.core import mail
+from django.core.management import call_command
 from django.conf import settings
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
-from ..models import RegisterChallenge
+from ..models import RegisterChallenge, OutgoingEmail
 from .constants import USERNAME, PASSWORD, EMAIL, CHALLENGE_TOKEN, CHALLENGE_ANSWER
 
 class RegisterTestCase(APITestCase):
     @staticmethod
-    def solve_challenge(token: str) -> str:
+    def solve_challenge(token: str, difficulty: int) -> str:
         while True:
             answer = ''.join(
                     random.choice(string.ascii_lowercase)
                     for _ in range(6)
                 )
             digest = hashlib.sha256((token + answer).encode()).hexdigest()
-            if digest.startswith("000000"):
+            if digest.startswith('0' * difficulty):
                 return answer
 
     def test_basic(self):
@@ -28,7 +31,8 @@ class RegisterTestCase(APITestCase):
         self.assertIn('challenge', response.data)
         challenge_id = response.data['id']
         challenge_token = response.data['challenge']
-        challenge_answer = RegisterTestCase.solve_challenge(challenge_token)
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY)
+        challenge_answer = RegisterTestCase.solve_challenge(challenge_token, response.data['difficulty'])
 
         response = self.client.post(
             reverse('auth-register'),
@@ -45,8 +49,14 @@ class RegisterTestCase(APITestCase):
         token = response.data['token']
         self.client.credentials(HTTP_AUTHORIZATION="Token " + token)
 
+        # queued, not sent during the request
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.filter(recipient=EMAIL).count(), 1)
+        call_command('send_emails', once=True, stdout=StringIO())
         self.assertEqual(len(mail.outbox), 1)
         self.assertEqual(mail.outbox[0].subject, settings.EMAIL_VALIDATION_SUBJECT)
+        self.assertEqual(mail.outbox[0].to, [EMAIL])
+        self.assertIsNotNone(OutgoingEmail.objects.get(recipient=EMAIL).sent_at)
 
         response = self.client.get(reverse('auth-test-am_i_logged'))
         self.assertEqual(response.status_code, 200)
@@ -58,7 +68,7 @@ class RegisterTestCase(APITestCase):
         response = self.client.get(reverse('auth-register-challenge'), { 'email': 'notanemail' })
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['email'][0].code, 'invalid')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_different_emails(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -78,7 +88,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['detail'].code, 'challenge_for_another_email')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_same_email(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -108,7 +118,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['email'][0].code, 'unique')
-        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
 
     def test_same_username(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -138,7 +148,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['username'][0].code, 'unique')
-        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
 
     def test_missing_username(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -157,7 +167,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['username'][0].code, 'required')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_missing_email(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -168,7 +178,7 @@ class RegisterTestCase(APITestCase):
         response = self.client.get(reverse('auth-register-challenge'))
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['email'][0].code, 'required')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
         response = self.client.post(
             reverse('auth-register'),
             {
@@ -180,7 +190,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['email'][0].code, 'required')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_missing_password(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -199,7 +209,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['password'][0].code, 'required')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_password_too_short(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -219,7 +229,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['password'][0].code, 'password_too_short')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_wrong_challenge(self):
         challenge_id = RegisterChallenge.objects.create(
@@ -239,7 +249,7 @@ class RegisterTestCase(APITestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertEqual(response.data['detail'].code, 'challenge_fail')
-        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutgoingEmail.objects.count(), 0)
 
     def test_ask_challenge_twice(self):
         response = self.client.get(reverse('auth-register-challenge'), { 'email': EMAIL })
@@ -254,3 +264,63 @@ class RegisterTestCase(APITestCase):
         self.assertIn('challenge', response.data)
         self.assertEqual(challenge_id, response.data['id'])
         self.assertEqual(challenge_token, response.data['challenge'])
+
+    def test_difficulty(self):
+        for i in range(settings.REGISTER_CHALLENGE_IP_LIMIT - 1):
+            RegisterChallenge.objects.create(
+                challenge=CHALLENGE_TOKEN,
+                email='{}@test.fr'.format(i),
+                expire_at=timezone.now() + settings.REGISTER_CHALLENGE_EXPIRATION,
+                ip='127.0.0.1',
+            )
+        response = self.client.get(reverse('auth-register-challenge'), { 'email': EMAIL })
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY)
+        # the ip limit is reached
+        response = self.client.get(reverse('auth-register-challenge'), { 'email': 'other@test.fr' })
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY + 1)
+
+        # the global limit is reached, by other ips
+        for i in range(settings.REGISTER_CHALLENGE_GLOBAL_LIMIT):
+            RegisterChallenge.objects.create(
+                challenge=CHALLENGE_TOKEN,
+                email='global{}@test.fr'.format(i),
+                expire_at=timezone.now() + settings.REGISTER_CHALLENGE_EXPIRATION,
+                ip='10.0.0.{}'.format(i % 200),
+            )
+        response = self.client.get(reverse('auth-register-challenge'), { 'email': 'another@test.fr' })
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY + 1)
+
+        # older challenges are not counted
+        RegisterChallenge.objects.update(created_at=timezone.now() - 2 * settings.REGISTER_CHALLENGE_RATE_WINDOW)
+        response = self.client.get(reverse('auth-register-challenge'), { 'email': 'last@test.fr' })
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY)
+
+    @override_settings(REGISTER_CHALLENGE_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_difficulty_behind_proxy(self):
+        for i in range(settings.REGISTER_CHALLENGE_IP_LIMIT):
+            RegisterChallenge.objects.create(
+                challenge=CHALLENGE_TOKEN,
+                email='{}@test.fr'.format(i),
+                expire_at=timezone.now() + settings.REGISTER_CHALLENGE_EXPIRATION,
+                ip='203.0.113.7',
+            )
+        # the address appended by the proxy counts, not REMOTE_ADDR nor the ones sent by the client
+        response = self.client.get(
+            reverse('auth-register-challenge'),
+            { 'email': EMAIL },
+            HTTP_X_FORWARDED_FOR='10.0.0.1, 203.0.113.7',
+        )
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY + 1)
+        self.assertEqual(RegisterChallenge.objects.get(email=EMAIL).ip, '203.0.113.7')
+        response = self.client.get(
+            reverse('auth-register-challenge'),
+            { 'email': 'other@test.fr' },
+            HTTP_X_FORWARDED_FOR='203.0.113.7, 198.51.100.2',
+        )
+        self.assertEqual(response.data['difficulty'], settings.REGISTER_CHALLENGE_DIFFICULTY)
+
+    def test_generic_difficulty(self):
+        challenge = RegisterChallenge(challenge=CHALLENGE_TOKEN, difficulty=6)
+        self.assertTrue(challenge.is_solved_by(CHALLENGE_ANSWER))
+        challenge.difficulty = 8
+        self.assertFalse(challenge.is_solved_by(CHALLENGE_ANSWER))
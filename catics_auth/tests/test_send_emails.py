@@ -0,0 +1,75 @@
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core import mail
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from freezegun import freeze_time
+from ..models import OutgoingEmail
+from ..management.commands.send_emails import Command
+
+class SendEmailsTestCase(TestCase):
+    def queue(self, n: int):
+        for i in range(n):
+            OutgoingEmail.objects.create(
+                recipient='{}@test.fr'.format(i),
+                subject='subject',
+                message='message',
+            )
+
+    def send(self, **options):
+        call_command('send_emails', once=True, stdout=StringIO(), **options)
+
+    def test_batches(self):
+        self.queue(5)
+        self.send(batch_size=2)
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertFalse(OutgoingEmail.objects.filter(sent_at=None).exists())
+        # already sent
+        self.send()
+        self.assertEqual(len(mail.outbox), 5)
+
+    def test_retries(self):
+        self.queue(1)
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=OSError('unreachable')):
+            self.send()
+        email = OutgoingEmail.objects.get()
+        self.assertIsNone(email.sent_at)
+        self.assertEqual(email.n_attempts, 1)
+        self.assertIn('unreachable', email.last_error)
+
+        # not before the delay
+        self.send()
+        self.assertEqual(len(mail.outbox), 0)
+
+        with freeze_time(timezone.now() + settings.EMAIL_RETRY_DELAY):
+            self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        email.refresh_from_db()
+        self.assertEqual(email.n_attempts, 2)
+        self.assertIsNotNone(email.sent_at)
+
+    def test_claimed(self):
+        self.queue(3)
+        # another worker claimed two of them
+        claimed = Command().claim(2)
+        self.assertEqual(len(claimed), 2)
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Command().claim(10), [])
+
+        # that worker stopped before sending them
+        with freeze_time(timezone.now() + settings.EMAIL_CLAIM_DURATION):
+            self.send()
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(
+            sorted(m.to[0] for m in mail.outbox),
+            sorted(OutgoingEmail.objects.values_list('recipient', flat=True)),
+        )
+
+    def test_max_attempts(self):
+        self.queue(1)
+        OutgoingEmail.objects.update(n_attempts=settings.EMAIL_MAX_ATTEMPTS)
+        self.send()
+        self.assertEqual(len(mail.outbox), 0)
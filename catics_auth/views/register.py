@@ -1,7 +1,5 @@
-import hashlib
 import random
 import string
-from django.core import mail
 from django.conf import settings
 from django.utils import timezone
 from django.urls import reverse
@@ -10,7 +8,7 @@ from django.contrib.auth.password_validation import validate_password
 from rest_framework import permissions, serializers
 from rest_framework.response import Response
 from knox.views import LoginView as KnoxLoginView
-from ..models import Validation, RegisterChallenge
+from ..models import Validation, RegisterChallenge, OutgoingEmail
 from .exceptions import ChallengeForAnotherEmailException, ChallengeFailException
 
 User = get_user_model()
@@ -39,10 +37,7 @@ class RegisterView(KnoxLoginView):
         # check challenge
         if data['challenge_id'].email != data['email']:
             raise ChallengeForAnotherEmailException()
-        digest = hashlib.sha256(
-            (data['challenge_id'].challenge + data['challenge_answer']).encode()
-        ).hexdigest()
-        if not digest.startswith("000000"):
+        if not data['challenge_id'].is_solved_by(data['challenge_answer']):
             raise ChallengeFailException()
         
         user = User.objects.create_user(
@@ -59,14 +54,14 @@ class RegisterView(KnoxLoginView):
             expire_at=timezone.now() + settings.EMAIL_VALIDATION_EXPIRATION,
             validation_code=code,
         )
-        mail.send_mail(
-            from_email=settings.EMAIL_FROM,
-            recipient_list=[user.email],
+        # sent by the send_emails command
+        OutgoingEmail.objects.create(
+            recipient=user.email,
             subject=settings.EMAIL_VALIDATION_SUBJECT,
             message=settings.BASE_URL + reverse('auth-validate', query={
                 'email': user.email,
                 'code': code,
-            })
+            }),
         )
         login(request, user)
         return super(RegisterView, self).post(request)
@@ -1,5 +1,6 @@
 import random
 import string
+from ipaddress import ip_address
 from django.conf import settings
 from django.utils import timezone
 from rest_framework import serializers
@@ -10,6 +11,39 @@ from ..models import RegisterChallenge
 class RegisterChallengeSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
+def client_ip(request) -> str | None:
+    '''
+    the address of the client, behind a proxy it is the last one it appended to
+    REGISTER_CHALLENGE_IP_HEADER, the ones before it come from the client
+    '''
+    if settings.REGISTER_CHALLENGE_IP_HEADER is None:
+        return request.META.get('REMOTE_ADDR')
+    addresses = request.META.get(settings.REGISTER_CHALLENGE_IP_HEADER, '').split(',')
+    try:
+        return str(ip_address(addresses[-1].strip()))
+    except ValueError:
+        return None
+
+def challenge_difficulty(ip: str | None) -> int:
+    '''
+    the base difficulty, plus one each time the recent challenges reach their limit,
+    which is multiplied by 16 every time
+    '''
+    recent = RegisterChallenge.objects.filter(
+        created_at__gte=timezone.now() - settings.REGISTER_CHALLENGE_RATE_WINDOW,
+    )
+    extra = 0
+    for (n, limit) in (
+        (recent.filter(ip=ip).count() if ip is not None else 0, settings.REGISTER_CHALLENGE_IP_LIMIT),
+        (recent.count(), settings.REGISTER_CHALLENGE_GLOBAL_LIMIT),
+    ):
+        n_extra = 0
+        while n >= limit:
+            n_extra += 1
+            limit *= 16
+        extra = max(extra, n_extra)
+    return min(settings.REGISTER_CHALLENGE_DIFFICULTY + extra, settings.REGISTER_CHALLENGE_DIFFICULTY_MAX)
+
 class RegisterChallengeView(APIView):
     def get(self, request, format=None):
         # we do not check if the email is taken so a bruteforcer cannot dump email addresses
@@ -24,18 +58,23 @@ class RegisterChallengeView(APIView):
             return Response({
                 'id': challenge.id,
                 'challenge': challenge.challenge,
+                'difficulty': challenge.difficulty,
             })
 
         challenge = ''.join(
                 random.choice(string.ascii_lowercase)
                 for _ in range(settings.REGISTER_CHALLENGE_SIZE)
             )
-        challenge_id = RegisterChallenge.objects.create(
+        ip = client_ip(request)
+        challenge = RegisterChallenge.objects.create(
             challenge=challenge,
             email=data['email'],
             expire_at=timezone.now() + settings.REGISTER_CHALLENGE_EXPIRATION,
-        ).id
+            ip=ip,
+            difficulty=challenge_difficulty(ip),
+        )
         return Response({
-            'id': challenge_id,
-            'challenge': challenge,
+            'id': challenge.id,
+            'challenge': challenge.challenge,
+            'difficulty': challenge.difficulty,
         })
@@ -1,6 +1,7 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from django.db import transaction
 from django.core.exceptions import ValidationError
 from rest_framework import serializers
 from rest_framework.response import Response
@@ -43,6 +44,8 @@ class ValidateView(APIView):
             return Response(True)
         if validation.expire_at < timezone.now():
             raise ExpiredException()
-        validations.update(is_validated=True, is_usable=False)
+        with transaction.atomic():
+            validations.update(is_validated=True, is_usable=False)
+            User.objects.filter(id=user.id).update(is_validated=True)
         return Response(True)
 
@@ -1,6 +1,10 @@
 from django.contrib import admin
-from .models import Agent, AgentVersion, Game
+from .models import Agent, AgentVersion, Game, Move, GameSnapshot, MatchResult, Rating
 
 admin.site.register(Agent)
 admin.site.register(AgentVersion)
 admin.site.register(Game)
+admin.site.register(Move)
+admin.site.register(GameSnapshot)
+admin.site.register(MatchResult)
+admin.site.register(Rating)
@@ -0,0 +1,40 @@
+import logging
+from typing import Iterable
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from .game_state import GameState
+from .notifier import notifier
+
+logger = logging.getLogger(__name__)
+
+def group_name(game_id: int) -> str:
+    return 'game-{}'.format(game_id)
+
+def game_diff(state: GameState, squares: Iterable[tuple[int, int]]) -> dict:
+    '''
+    the new value of the given squares, None for the empty ones, and the rest of the game
+    '''
+    diff = state.value()
+    del diff['board']
+    diff['squares'] = []
+    for (x, y) in sorted(set(squares)):
+        position = state.board.get(x, y)
+        diff['squares'].append([x, y, None if position is None else [position.is_player1, position.is_cat]])
+    return diff
+
+def broadcast(state: GameState, squares: Iterable[tuple[int, int]]):
+    '''
+    wakes up the long polling requests and pushes the diff to the game sockets,
+    must be called once the move is committed, so a channel layer which fails only loses the diff:
+    the sockets miss it, the move and its response are not affected
+    '''
+    notifier.notify(state.id, state.ply)
+    try:
+        channel_layer = get_channel_layer()
+        if channel_layer is not None:
+            async_to_sync(channel_layer.group_send)(
+                group_name(state.id),
+                { 'type': 'game.diff', 'diff': game_diff(state, squares) },
+            )
+    except Exception:
+        logger.exception('the diff of the game %s could not be sent to its sockets', state.id)
@@ -0,0 +1,72 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from rest_framework.exceptions import APIException
+from .models import Game
+from .broadcast import group_name
+from .views.game import game_value
+from .views.play import PlaySerializer, play
+from .views.promote import PromoteSerializer, promote
+
+class GameConsumer(AsyncJsonWebsocketConsumer):
+    '''
+    sends the game once connected, then a diff after every move,
+    and plays the moves received as { "type": "play", "x", "y", "is_cat" }
+    or { "type": "promote", "units" }
+    '''
+
+    async def connect(self):
+        self.game_id = self.scope['url_route']['kwargs']['game_id']
+        self.user = self.scope['user']
+        game = await self.get_game()
+        if game is None:
+            await self.close()
+            return
+        await self.channel_layer.group_add(group_name(self.game_id), self.channel_name)
+        await self.accept()
+        await self.send_json({ 'type': 'game', 'game': game })
+
+    async def disconnect(self, code):
+        await self.channel_layer.group_discard(group_name(self.game_id), self.channel_name)
+
+    async def receive_json(self, content):
+        error = await self.move(content)
+        if error is not None:
+            await self.send_json({ 'type': 'error', 'error': error })
+
+    async def game_diff(self, event):
+        await self.send_json({ 'type': 'diff', 'diff': event['diff'] })
+
+    @database_sync_to_async
+    def get_game(self) -> dict | None:
+        '''
+        the value of the game, None when the user cannot see it
+        '''
+        if not self.user.is_authenticated or not self.user.is_validated:
+            return None
+        game = Game.objects.filter(id=self.game_id).first()
+        return None if game is None else game_value(game)
+
+    @database_sync_to_async
+    def move(self, content) -> dict | None:
+        '''
+        plays the move, the errors are returned like the views would
+        '''
+        if not isinstance(content, dict) or content.get('type') not in ('play', 'promote'):
+            return { 'type': ['Veuillez renseigner "play" ou "promote"'] }
+        data = { **content, 'game': self.game_id }
+        try:
+            if content['type'] == 'play':
+                serializer = PlaySerializer(data=data)
+                if not serializer.is_valid():
+                    return serializer.errors
+                data = serializer.validated_data
+                play(data['game'], self.user, data['x'], data['y'], data['is_cat'])
+            else:
+                serializer = PromoteSerializer(data=data)
+                if not serializer.is_valid():
+                    return serializer.errors
+                data = serializer.validated_data
+                promote(data['game'], self.user, data['units'])
+        except APIException as e:
+            return { 'detail': e.detail, 'code': e.get_codes() }
+        return None
@@ -1,4 +1,7 @@
 from .board import Board
+from .bitboard import BitBoard
+from .changes import Changes
 from .counts import Counts
 from .position import Position
+from .placement import Placement
 from .game_state import GameState
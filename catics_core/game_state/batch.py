@@ -0,0 +1,152 @@
+import numpy as np
+from .placement import Placement
+from .promotions import Promotion
+from .bitboard import PUSHES, SQUARES_XY, FULL
+from .windows import WINDOWS, WINDOW_MASKS
+
+# (square, direction) -> neighbor and destination bits, as in PUSHES, 0 when there is none
+NEIGHBORS = np.zeros((36, 8), dtype=np.uint64)
+DESTINATIONS = np.zeros((36, 8), dtype=np.uint64)
+for (square, pushes) in enumerate(PUSHES):
+    for (direction, (neighbor, destination)) in enumerate(pushes):
+        NEIGHBORS[square, direction] = neighbor
+        DESTINATIONS[square, direction] = destination
+SQUARE_BITS = np.left_shift(np.uint64(1), np.arange(36, dtype=np.uint64))
+WINDOW_ARRAY = np.array(WINDOW_MASKS, dtype=np.uint64)
+# the promotions in the order of GameState.play: the windows, the kittens of player 1, then of player 2
+N_WINDOWS = len(WINDOW_MASKS)
+CANDIDATE_MASKS = np.concatenate([WINDOW_ARRAY, SQUARE_BITS, SQUARE_BITS])
+
+def squares(masks: np.ndarray) -> np.ndarray:
+    '''
+    (n, 36) booleans, the squares set in each mask
+    '''
+    return (masks[:, None] & SQUARE_BITS) != 0
+
+def pick(candidates: np.ndarray, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    a uniformly random candidate of each row, and the number of candidates of each row
+    '''
+    counts = candidates.sum(axis=1)
+    ranks = (rng.random(len(candidates)) * counts).astype(np.int64)
+    return (np.argmax(np.cumsum(candidates, axis=1) > ranks[:, None], axis=1), counts)
+
+class BatchSimulator:
+    '''
+    Plays random games on n boards at once, same rules as GameState,
+    every step plays one move (and the promotion it requires) on every running board
+
+    units are indexed like BitBoard.units: is_player1 * 2 + is_cat, so are the units in hand
+    '''
+
+    def __init__(self, n_games: int, seed: int = 0, max_plies: int = 500, record: bool = False):
+        self.units = np.zeros((n_games, 4), dtype=np.uint64)
+        self.hands = np.zeros((n_games, 4), dtype=np.int64)
+        self.hands[:, 0] = 8
+        self.hands[:, 2] = 8
+        self.is_p1_turn = np.ones(n_games, dtype=bool)
+        # 0 while nobody won, 1 or 2
+        self.winner = np.zeros(n_games, dtype=np.int8)
+        self.ply = np.zeros(n_games, dtype=np.int64)
+        self.max_plies = max_plies
+        self.rng = np.random.default_rng(seed)
+        # for every step: the games, the squares, the unit types, the chosen promotions or -1
+        self.steps = [] if record else None
+
+    def run(self) -> int:
+        '''
+        plays until every game is over, returns the number of plies played
+        '''
+        n_plies = 0
+        while True:
+            n = self.step()
+            if n == 0:
+                return n_plies
+            n_plies += n
+
+    def step(self) -> int:
+        '''
+        returns the number of plies played
+        '''
+        games = np.nonzero((self.winner == 0) & (self.ply < self.max_plies))[0]
+        n = len(games)
+        if n == 0:
+            return 0
+        rows = np.arange(n)
+        units = self.units[games]
+        hands = self.hands[games]
+        is_p1_turn = self.is_p1_turn[games]
+        mover = is_p1_turn.astype(np.int64)
+
+        # placement: a random empty square, then a random unit type among the ones in hand
+        has_kittens = hands[rows, mover * 2] > 0
+        has_cats = hands[rows, mover * 2 + 1] > 0
+        is_cat = np.where(has_kittens & has_cats, self.rng.random(n) < 0.5, has_cats)
+        occupied = units[:, 0] | units[:, 1] | units[:, 2] | units[:, 3]
+        (square, _) = pick(squares(~occupied & np.uint64(FULL)), self.rng)
+        plane = mover * 2 + is_cat
+        units[rows, plane] |= SQUARE_BITS[square]
+        hands[rows, plane] -= 1
+
+        # pushes, in the 8 directions at once: they never share a neighbor or a destination
+        pushable = np.where(is_cat, occupied, units[:, 0] | units[:, 2])
+        neighbors = NEIGHBORS[square]
+        destinations = DESTINATIONS[square]
+        pushed = ((pushable[:, None] & neighbors) != 0) & ((occupied[:, None] & destinations) == 0)
+        moving = pushed[:, :, None] & ((units[:, None, :] & neighbors[:, :, None]) != 0)
+        zero = np.uint64(0)
+        removed = np.bitwise_or.reduce(np.where(moving, neighbors[:, :, None], zero), axis=1)
+        added = np.bitwise_or.reduce(np.where(moving, destinations[:, :, None], zero), axis=1)
+        units = (units & ~removed) | added
+        hands += (moving & (destinations[:, :, None] == 0)).sum(axis=1)
+
+        # promotions: the lines of the mover, and the kittens of a player without units in hand
+        player = np.where(is_p1_turn, units[:, 2] | units[:, 3], units[:, 0] | units[:, 1])
+        lines = (player[:, None] & WINDOW_ARRAY) == WINDOW_ARRAY
+        empty_p1 = hands[:, 2] + hands[:, 3] == 0
+        empty_p2 = hands[:, 0] + hands[:, 1] == 0
+        winner = np.zeros(n, dtype=np.int8)
+        winner[empty_p1 & (units[:, 2] == 0)] = 1
+        winner[empty_p2 & (units[:, 0] == 0)] = 2
+        candidates = np.concatenate([
+            lines,
+            squares(units[:, 2]) & empty_p1[:, None],
+            squares(units[:, 0]) & empty_p2[:, None],
+        ], axis=1)
+        (index, n_candidates) = pick(candidates, self.rng)
+
+        # a single promotion is done at once, otherwise the mover chooses one if nobody won
+        promoted = (n_candidates == 1) | ((n_candidates > 1) & (winner == 0))
+        chosen = promoted & (n_candidates > 1)
+        mask = np.where(promoted, CANDIDATE_MASKS[index], zero)
+        n_cats = np.bitwise_count(mask & (units[:, 1] | units[:, 3]))
+        units &= ~mask[:, None]
+        hands[rows, mover * 2 + 1] += np.bitwise_count(mask)
+        winner = np.where(promoted & (n_cats == 3), np.where(is_p1_turn, 1, 2), winner).astype(np.int8)
+
+        self.units[games] = units
+        self.hands[games] = hands
+        self.winner[games] = winner
+        self.is_p1_turn[games] = np.where(n_candidates > 1, is_p1_turn != promoted, ~is_p1_turn)
+        self.ply[games] += 1 + chosen
+        if self.steps is not None:
+            self.steps.append((games, square, is_cat, np.where(chosen, index, -1)))
+        return n + int(chosen.sum())
+
+    def moves(self, game: int) -> list[Placement | Promotion]:
+        '''
+        the moves of a game, as GameState.make_move receives them, the steps must be recorded
+        '''
+        moves = []
+        for (games, square, is_cat, promotion) in self.steps:
+            i = np.searchsorted(games, game)
+            if i == len(games) or games[i] != game:
+                continue
+            moves.append(Placement(*SQUARES_XY[square[i]], bool(is_cat[i])))
+            if promotion[i] < 0:
+                continue
+            if promotion[i] < N_WINDOWS:
+                moves.append(Promotion(list(WINDOWS[promotion[i]])))
+            else:
+                moves.append(Promotion([SQUARES_XY[(promotion[i] - N_WINDOWS) % 36]]))
+        return moves
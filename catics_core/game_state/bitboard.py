@@ -0,0 +1,212 @@
+from io import StringIO
+from typing import Optional
+from .position import Position
+from .changes import Changes
+from .exceptions import OccupiedException
+from .promotions import Promotion
+from .windows import Lines
+from .zobrist import SQUARES
+
+def _pushes(x: int, y: int) -> tuple[tuple[int, int], ...]:
+    # (neighbor, destination) bits, destination is 0 when the pushed unit falls
+    pushes = []
+    for x_offset in range(-1, 2):
+        for y_offset in range(-1, 2):
+            if y_offset == 0 and x_offset == 0:
+                continue
+            x_neighbor = x + x_offset
+            y_neighbor = y + y_offset
+            if not (0 <= x_neighbor < 6 and 0 <= y_neighbor < 6):
+                continue
+            x_new = x_neighbor + x_offset
+            y_new = y_neighbor + y_offset
+            destination = 1 << (x_new * 6 + y_new) if 0 <= x_new < 6 and 0 <= y_new < 6 else 0
+            pushes.append((1 << (x_neighbor * 6 + y_neighbor), destination))
+    return tuple(pushes)
+
+PUSHES = tuple(_pushes(x, y) for x in range(6) for y in range(6))
+SQUARES_XY = tuple(divmod(square, 6) for square in range(36))
+FULL = (1 << 36) - 1
+
+class BitBoard:
+    '''
+    Same API as Board, but each player / unit type is stored as a 36 bits integer:
+    the bit x * 6 + y is set when there is such a unit on (x, y)
+    '''
+
+    def __init__(self, board: dict[int, dict[int, tuple[bool, bool]]]):
+        # indexed by is_player1 * 2 + is_cat
+        units = [0, 0, 0, 0]
+        for (x, column) in board.items():
+            x = int(x)
+            for (y, position) in column.items():
+                y = int(y)
+                units[position[0] * 2 + position[1]] |= 1 << (x * 6 + y)
+        self._load(units)
+
+    @classmethod
+    def from_planes(cls, planes: tuple[int, int, int, int]) -> 'BitBoard':
+        board = cls.__new__(cls)
+        board._load(list(planes))
+        return board
+
+    def _load(self, units: list[int]):
+        self.units = units
+        # zobrist hash of the units
+        self.hash = 0
+        for i in range(4):
+            remaining = units[i]
+            while remaining:
+                lowest = remaining & -remaining
+                self.hash ^= SQUARES[lowest.bit_length() - 1][i]
+                remaining ^= lowest
+        self.lines = Lines(*self.players())
+
+    def __len__(self):
+        return (self.units[0] | self.units[1] | self.units[2] | self.units[3]).bit_count()
+
+    def __repr__(self) -> str:
+        LINE_SEPARATION = '+-----+-----+-----+-----+-----+-----+\n'
+        builder = StringIO()
+        builder.write('\n')
+        builder.write(LINE_SEPARATION)
+        for y in range(6):
+            for x in range(6):
+                builder.write('| ')
+                position = self.get(x, y)
+                if position is None:
+                    builder.write('    ')
+                    continue
+                builder.write(str(position))
+                builder.write(' ')
+            builder.write('|\n')
+            builder.write(LINE_SEPARATION)
+        return builder.getvalue()
+
+    def get(self, x: int, y: int) -> Optional[Position]:
+        if not (0 <= x < 6 and 0 <= y < 6):
+            return None
+        bit = 1 << (x * 6 + y)
+        for i in range(4):
+            if self.units[i] & bit:
+                return Position(i >= 2, i & 1 == 1)
+        return None
+
+    def play(self, x: int, y: int, position: Position) -> Changes:
+        changes = Changes(x, y, position)
+        units = self.units
+        bit = 1 << (x * 6 + y)
+        occupied = units[0] | units[1] | units[2] | units[3]
+        if occupied & bit:
+            raise OccupiedException()
+        units[position.is_player1 * 2 + position.is_cat] |= bit
+        self.hash ^= SQUARES[x * 6 + y][position.is_player1 * 2 + position.is_cat]
+
+        # kittens cannot push cats
+        pushable = occupied if position.is_cat else units[0] | units[2]
+        for (neighbor, destination) in PUSHES[x * 6 + y]:
+            # nothing to push, or blocked by another unit
+            if not pushable & neighbor or occupied & destination:
+                continue
+            for i in range(4):
+                if units[i] & neighbor:
+                    break
+            units[i] ^= neighbor
+            neighbor_index = neighbor.bit_length() - 1
+            (x_neighbor, y_neighbor) = SQUARES_XY[neighbor_index]
+            self.hash ^= SQUARES[neighbor_index][i]
+
+            # fall
+            if destination == 0:
+                changes.fall(x_neighbor, y_neighbor, Position(i >= 2, i & 1 == 1))
+                continue
+
+            units[i] |= destination
+            destination_index = destination.bit_length() - 1
+            self.hash ^= SQUARES[destination_index][i]
+            changes.move(x_neighbor, y_neighbor, *SQUARES_XY[destination_index])
+
+        self.lines.update(changes.mask, *self.players())
+        return changes
+
+    def unplay(self, changes: Changes):
+        '''
+        cancels the play which returned these changes, it must be the last change of the board
+        '''
+        units = self.units
+        for ((x, y), (x_new, y_new)) in changes.moved:
+            destination = 1 << (x_new * 6 + y_new)
+            for i in range(4):
+                if units[i] & destination:
+                    break
+            units[i] ^= destination | 1 << (x * 6 + y)
+            self.hash ^= SQUARES[x_new * 6 + y_new][i] ^ SQUARES[x * 6 + y][i]
+        for ((x, y), position) in changes.fallen:
+            units[position.is_player1 * 2 + position.is_cat] |= 1 << (x * 6 + y)
+            self.hash ^= SQUARES[x * 6 + y][position.is_player1 * 2 + position.is_cat]
+        (x, y) = changes.placed
+        i = changes.position.is_player1 * 2 + changes.position.is_cat
+        units[i] ^= 1 << (x * 6 + y)
+        self.hash ^= SQUARES[x * 6 + y][i]
+        self.lines.update(changes.mask, *self.players())
+
+    def pop(self, x: int, y: int) -> Position:
+        bit = 1 << (x * 6 + y)
+        for i in range(4):
+            if self.units[i] & bit:
+                self.units[i] ^= bit
+                self.hash ^= SQUARES[x * 6 + y][i]
+                self.lines.update(bit, *self.players())
+                return Position(i >= 2, i & 1 == 1)
+        raise KeyError((x, y))
+
+    def put(self, x: int, y: int, position: Position):
+        '''
+        puts back a popped unit, without any push
+        '''
+        bit = 1 << (x * 6 + y)
+        self.units[position.is_player1 * 2 + position.is_cat] |= bit
+        self.hash ^= SQUARES[x * 6 + y][position.is_player1 * 2 + position.is_cat]
+        self.lines.update(bit, *self.players())
+
+    def planes(self) -> tuple[int, int, int, int]:
+        return tuple(self.units)
+
+    def players(self) -> tuple[int, int]:
+        '''
+        masks of the units of player 1 and player 2
+        '''
+        return (self.units[2] | self.units[3], self.units[0] | self.units[1])
+
+    def empty_squares(self) -> list[tuple[int, int]]:
+        empty = ~(self.units[0] | self.units[1] | self.units[2] | self.units[3]) & FULL
+        squares = []
+        while empty:
+            lowest = empty & -empty
+            squares.append(SQUARES_XY[lowest.bit_length() - 1])
+            empty ^= lowest
+        return squares
+
+    def look_for_promotions(self, is_player1: bool) -> list[Promotion]:
+        return self.lines.promotions(is_player1)
+
+    def get_all_kittens(self, is_player1: bool) -> list[Promotion]:
+        promotions = []
+        kittens = self.units[2] if is_player1 else self.units[0]
+        while kittens:
+            lowest = kittens & -kittens
+            promotions.append(Promotion([SQUARES_XY[lowest.bit_length() - 1]]))
+            kittens ^= lowest
+        return promotions
+
+    def value(self) -> dict[int, dict[int, tuple[bool, bool]]]:
+        value = {}
+        for x in range(6):
+            for y in range(6):
+                position = self.get(x, y)
+                if position is None:
+                    continue
+                if x not in value:
+                    value[x] = {}
+                value[x][y] = [position.is_player1, position.is_cat]
+        return value
@@ -1,23 +1,30 @@
 from io import StringIO
 from typing import Optional
 from .position import Position
-from .counts import Counts
+from .changes import Changes
 from .exceptions import OccupiedException
 from .promotions import Promotion
-from .opportunities import Opportunities, \
-    ColumnOpportunities, \
-    LineOpportunities, \
-    DiagonalOpportunities
+from .windows import Lines
+from .zobrist import square_key
+from ..models.board_encoding import planes_from_value, value_from_planes
 
 class Board:
     def __init__(self, board: dict[int, dict[int, tuple[bool, bool]]]):
         self.board = {}
+        # zobrist hash of the units
+        self.hash = 0
+        # masks of the units of player 2 and player 1, kept by _put and _take
+        self.masks = [0, 0]
         for (x, column) in board.items():
             x = int(x)
-            self.board[x] = {}
             for (y, position) in column.items():
                 y = int(y)
-                self.board[x][y] = Position(position[0], position[1])
+                self._put(x, y, Position(position[0], position[1]))
+        self.lines = Lines(*self.players())
+
+    @classmethod
+    def from_planes(cls, planes: tuple[int, int, int, int]) -> 'Board':
+        return cls(value_from_planes(planes))
 
     def __len__(self):
         result = 0
@@ -50,13 +57,11 @@ class Board:
         return self.board[x][y]
         
 
-    def play(self, x: int, y: int, position: Position) -> Counts:
-        fallen = Counts()
-        if x not in self.board:
-            self.board[x] = {}
-        elif y in self.board[x]:
+    def play(self, x: int, y: int, position: Position) -> Changes:
+        changes = Changes(x, y, position)
+        if x in self.board and y in self.board[x]:
             raise OccupiedException()
-        self.board[x][y] = position
+        self._put(x, y, position)
 
         # push neighbors
         for x_offset in range(-1, 2):
@@ -81,54 +86,80 @@ class Board:
                     continue
 
                 # take pushed
-                pushed = self.pop(x_neighbor, y_neighbor)
+                pushed = self._take(x_neighbor, y_neighbor)
 
                 # fall
                 if not (0 <= x_new < 6 and 0 <= y_new < 6):
-                    fallen.add_pieces(pushed.is_player1, pushed.is_cat, 1)
+                    changes.fall(x_neighbor, y_neighbor, pushed)
                     continue
 
                 # put pushed
-                if x_new not in self.board:
-                    self.board[x_new] = {}
-                self.board[x_new][y_new] = pushed
+                self._put(x_new, y_new, pushed)
+                changes.move(x_neighbor, y_neighbor, x_new, y_new)
 
-        return fallen
+        self.lines.update(changes.mask, *self.players())
+        return changes
 
-    def pop(self, x: int, y: int) -> Position:
+    def _take(self, x: int, y: int) -> Position:
         result = self.board[x].pop(y)
         if len(self.board[x]) == 0:
             del self.board[x]
+        self.hash ^= square_key(x, y, result)
+        self.masks[result.is_player1] ^= 1 << (x * 6 + y)
         return result
 
-    def look_for_promotions(self, is_player1: bool) -> list[Promotion]:
-        promotions = Counts()
-        opportunities: list[Opportunities] = [
-            ColumnOpportunities(),
-            LineOpportunities(),
-            DiagonalOpportunities(),
-        ]
+    def _put(self, x: int, y: int, position: Position):
+        if x not in self.board:
+            self.board[x] = {}
+        self.board[x][y] = position
+        self.hash ^= square_key(x, y, position)
+        self.masks[position.is_player1] |= 1 << (x * 6 + y)
+
+    def unplay(self, changes: Changes):
+        '''
+        cancels the play which returned these changes, it must be the last change of the board
+        '''
+        for ((x, y), (x_new, y_new)) in changes.moved:
+            self._put(x, y, self._take(x_new, y_new))
+        for ((x, y), position) in changes.fallen:
+            self._put(x, y, position)
+        self._take(*changes.placed)
+        self.lines.update(changes.mask, *self.players())
 
-        for x in range(6):
-            if x not in self.board:
-                for o in opportunities:
-                    o.empty_column()
-                continue
-            for o in opportunities:
-                o.new_column()
-            for y in range(6):
-                if y not in self.board[x] or self.board[x][y].is_player1 != is_player1:
-                    for o in opportunities:
-                        o.empty_position(x, y)
-                    continue
-                for o in opportunities:
-                    o.new_position(x, y)
+    def pop(self, x: int, y: int) -> Position:
+        result = self._take(x, y)
+        self.lines.update(1 << (x * 6 + y), *self.players())
+        return result
 
-        promotions = []
-        for (i, o) in enumerate(opportunities):
-            promotions.extend(o.get_promotions())
+    def put(self, x: int, y: int, position: Position):
+        '''
+        puts back a popped unit, without any push
+        '''
+        self._put(x, y, position)
+        self.lines.update(1 << (x * 6 + y), *self.players())
+
+    def planes(self) -> tuple[int, int, int, int]:
+        '''
+        masks of the units, indexed by is_player1 * 2 + is_cat
+        '''
+        return planes_from_value(self.value())
+
+    def players(self) -> tuple[int, int]:
+        '''
+        masks of the units of player 1 and player 2 (bit x * 6 + y for (x, y))
+        '''
+        return (self.masks[1], self.masks[0])
+
+    def empty_squares(self) -> list[tuple[int, int]]:
+        return [
+            (x, y)
+            for x in range(6)
+            for y in range(6)
+            if x not in self.board or y not in self.board[x]
+        ]
 
-        return promotions
+    def look_for_promotions(self, is_player1: bool) -> list[Promotion]:
+        return self.lines.promotions(is_player1)
 
     def get_all_kittens(self, is_player1: bool) -> list[Promotion]:
         promotions = []
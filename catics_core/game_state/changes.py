@@ -0,0 +1,39 @@
+from .position import Position
+from .counts import Counts
+
+class Changes:
+    '''
+    What Board.play did: the placed unit, the pushed units and the fallen ones
+    '''
+
+    def __init__(self, x: int, y: int, position: Position):
+        self.placed = (x, y)
+        self.position = position
+        self.moved: list[tuple[tuple[int, int], tuple[int, int]]] = []
+        self.fallen: list[tuple[tuple[int, int], Position]] = []
+        self.fallen_counts = Counts()
+        # units removed by the promotion GameState.play did on its own, if any
+        self.promoted: list[tuple[tuple[int, int], Position]] = []
+        # bit x * 6 + y is set for every square that changed
+        self.mask = 1 << (x * 6 + y)
+
+    def __repr__(self) -> str:
+        return 'Changes(placed={}, moved={}, fallen={})'.format(self.placed, self.moved, self.fallen)
+
+    def move(self, x_from: int, y_from: int, x_to: int, y_to: int):
+        self.moved.append(((x_from, y_from), (x_to, y_to)))
+        self.mask |= 1 << (x_from * 6 + y_from) | 1 << (x_to * 6 + y_to)
+
+    def fall(self, x: int, y: int, position: Position):
+        self.fallen.append(((x, y), position))
+        self.fallen_counts.add_pieces(position.is_player1, position.is_cat, 1)
+        self.mask |= 1 << (x * 6 + y)
+
+    def squares(self) -> list[tuple[int, int]]:
+        squares = [self.placed]
+        for (origin, destination) in self.moved:
+            squares.append(origin)
+            squares.append(destination)
+        for (origin, _) in self.fallen:
+            squares.append(origin)
+        return squares
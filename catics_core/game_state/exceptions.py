@@ -17,3 +17,8 @@ class PromotionException(APIException):
     status_code = 400
     default_code = 'promotion'
     default_detail = 'Une promotion est en attente'
+
+class ConflictException(APIException):
+    status_code = 409
+    default_code = 'conflict'
+    default_detail = 'La partie a été modifiée entre-temps, veuillez réessayer'
@@ -1,13 +1,27 @@
-from ..models import Game
+from typing import Iterable, Iterator
+from django.conf import settings
+from django.utils import timezone
+from ..models import Game, Move, GameSnapshot
+from ..models.board_encoding import encode_planes
+from ..ratings import Players, record_results
 from . import Board
 from .position import Position
+from .placement import Placement
 from .counts import Counts
-from .exceptions import NoUnitsLeftException, PromotionException
+from .changes import Changes
+from .exceptions import NoUnitsLeftException, PromotionException, ConflictException
 from .promotions import Promotion
+from .zobrist import P1_TURN, counts_key, promotions_key
+
+def players_of(game: Game) -> Players:
+    return ((game.player1_type_id, game.player1_id), (game.player2_type_id, game.player2_id))
 
 class GameState:
-    def __init__(self, game: Game):
+    def __init__(self, game: Game, board_class: type = Board):
         self.id = game.id
+        self.ply = game.ply
+        # version of the game this state was read from, snapshots have none, see load
+        self.version = getattr(game, 'version', 0)
         self.is_p1_turn= game.is_p1_turn
         self.counts = Counts(
             game.n_kittens_p1,
@@ -15,17 +29,39 @@ class GameState:
             game.n_kittens_p2,
             game.n_cats_p2,
         )
-        self.board = Board(game.board)
+        self.board = board_class.from_planes(game.board_planes)
         self.winner = game.winner
+        # snapshots have none of these, see load
+        self.finished_at = getattr(game, 'finished_at', None)
+        self.players = players_of(game) if isinstance(game, Game) else ((None, None), (None, None))
         self.promotions = list(map(lambda p: Promotion(p), game.promotions))
+        self.promotions_hash = promotions_key(self.promotions)
+        # undo stack of make_move
+        self.history = []
+
+    @classmethod
+    def load(cls, game: Game, ply: int, board_class: type = Board) -> 'GameState':
+        '''
+        the state of the game after its ply-th move, from the closest snapshot and the moves log
+        '''
+        snapshot = game.snapshots.filter(ply__lte=ply).order_by('-ply').first()
+        state = cls(Game() if snapshot is None else snapshot, board_class)
+        state.id = game.id
+        state.version = game.version
+        state.players = players_of(game)
+        state.replay(game.moves.filter(ply__gt=state.ply, ply__lte=ply).order_by('ply'))
+        return state
 
-    def play(self, x: int, y: int, is_cat: bool):
+    def play(self, x: int, y: int, is_cat: bool) -> Changes:
         if not self.counts.is_sup(self.is_p1_turn, is_cat, 0):
             raise NoUnitsLeftException(is_cat)
         if len(self.promotions) > 0:
             raise PromotionException()
 
-        self.counts += self.board.play(x, y, Position(self.is_p1_turn, is_cat))
+        # raises before changing anything when the square is occupied
+        changes = self.board.play(x, y, Position(self.is_p1_turn, is_cat))
+        self.ply += 1
+        self.counts += changes.fallen_counts
         self.counts.add_pieces(self.is_p1_turn, is_cat, -1)
         self.promotions = self.board.look_for_promotions(self.is_p1_turn)
 
@@ -43,35 +79,210 @@ class GameState:
             # win!
             if len(kittens) == 0:
                 self.winner = '2'
+        self.promotions_hash = promotions_key(self.promotions)
 
         # if there is only one promotion opportunity, do it
         if len(self.promotions) == 1:
-            self.promote(0)
+            changes.promoted = self.promote(0)
 
         if len(self.promotions) == 0:
             self.is_p1_turn = not self.is_p1_turn
         # print(self.board)
+        return changes
 
-    def promote(self, promotion_index: int):
+    def promote(self, promotion_index: int) -> list[tuple[tuple[int, int], Position]]:
         promotion = self.promotions[promotion_index]
         self.promotions = []
+        self.promotions_hash = 0
+        removed = []
         n_cats = 0
         for u in promotion.units:
-            n_cats += 1 if self.board.pop(*u).is_cat else 0
+            position = self.board.pop(*u)
+            removed.append((tuple(u), position))
+            n_cats += 1 if position.is_cat else 0
         # win !
         if n_cats == 3:
             self.winner = '1' if self.is_p1_turn else '2'
         self.counts.add_pieces(self.is_p1_turn, True, len(promotion.units))
+        return removed
+
+    def choose_promotion(self, promotion_index: int) -> list[tuple[tuple[int, int], Position]]:
+        '''
+        a promotion chosen by the player, then it is the opponent's turn
+        '''
+        removed = self.promote(promotion_index)
+        self.is_p1_turn = not self.is_p1_turn
+        self.ply += 1
+        return removed
+
+    def replay(self, moves: Iterable[Move]):
+        for move in moves:
+            if move.promotion is None:
+                self.play(move.x, move.y, move.is_cat)
+                continue
+            units = [[list(u) for u in p.units] for p in self.promotions]
+            self.choose_promotion(units.index(move.promotion))
+
+    def legal_moves(self) -> Iterator[Placement | Promotion]:
+        '''
+        the pending promotions if any, the placements otherwise
+        '''
+        if self.winner != 'n':
+            return
+        if len(self.promotions) > 0:
+            yield from self.promotions
+            return
+        units = [
+            is_cat
+            for is_cat in (False, True)
+            if self.counts.is_sup(self.is_p1_turn, is_cat, 0)
+        ]
+        for (x, y) in self.board.empty_squares():
+            for is_cat in units:
+                yield Placement(x, y, is_cat)
+
+    @property
+    def hash(self) -> int:
+        '''
+        zobrist hash of the units, the player to move, the counts and the pending promotions
+        '''
+        return self.board.hash \
+            ^ (P1_TURN if self.is_p1_turn else 0) \
+            ^ counts_key(self.counts) \
+            ^ self.promotions_hash
+
+    def make_move(self, move: Placement | Promotion):
+        '''
+        plays a placement, or one of the pending promotions, in a way unmake_move can cancel
+        '''
+        entry = (
+            self.ply,
+            self.is_p1_turn,
+            self.winner,
+            self.promotions,
+            self.promotions_hash,
+            self.counts.n_kittens_p1,
+            self.counts.n_cats_p1,
+            self.counts.n_kittens_p2,
+            self.counts.n_cats_p2,
+        )
+        if isinstance(move, Promotion):
+            removed = self.choose_promotion(self.promotions.index(move))
+            self.history.append((None, removed, entry))
+        else:
+            changes = self.play(move.x, move.y, move.is_cat)
+            self.history.append((changes, changes.promoted, entry))
+
+    def unmake_move(self):
+        (changes, removed, entry) = self.history.pop()
+        for ((x, y), position) in removed:
+            self.board.put(x, y, position)
+        if changes is not None:
+            self.board.unplay(changes)
+        (
+            self.ply,
+            self.is_p1_turn,
+            self.winner,
+            self.promotions,
+            self.promotions_hash,
+            self.counts.n_kittens_p1,
+            self.counts.n_cats_p1,
+            self.counts.n_kittens_p2,
+            self.counts.n_cats_p2,
+        ) = entry
+
+    def value(self) -> dict:
+        '''
+        the game as GameView shows it, without the players
+        '''
+        value = {
+            'ply': self.ply,
+            'board': self.board.value(),
+            'n_kittens_p1': self.counts.n_kittens_p1,
+            'n_cats_p1': self.counts.n_cats_p1,
+            'n_kittens_p2': self.counts.n_kittens_p2,
+            'n_cats_p2': self.counts.n_cats_p2,
+        }
+        if len(self.promotions) > 0:
+            value['promotions'] = [[list(u) for u in p.units] for p in self.promotions]
+        if self.winner == 'n':
+            value['is_p1_turn'] = self.is_p1_turn
+        else:
+            value['winner'] = self.winner
+        return value
 
     def save(self):
-        Game.objects.filter(id=self.id).update(
+        '''
+        only if nobody saved the game since it was read, ConflictException otherwise
+        '''
+        finished = self.finish()
+        updated = Game.objects.filter(id=self.id, version=self.version).update(
+            version=self.version + 1,
+            **self.fields(),
+        )
+        if updated == 0:
+            if finished:
+                self.finished_at = None
+            raise ConflictException()
+        self.version += 1
+        if finished:
+            record_results([(self.players, self.winner)])
+
+    def finish(self) -> bool:
+        '''
+        sets finished_at when the game just got a winner, returns True then
+        '''
+        if self.winner == 'n' or self.finished_at is not None:
+            return False
+        self.finished_at = timezone.now()
+        return True
+
+    def fields(self) -> dict:
+        '''
+        the fields of the game this state saves, but the version
+        '''
+        return {
+            'ply': self.ply,
+            'is_p1_turn': self.is_p1_turn,
+            'n_kittens_p1': self.counts.n_kittens_p1,
+            'n_cats_p1': self.counts.n_cats_p1,
+            'n_kittens_p2': self.counts.n_kittens_p2,
+            'n_cats_p2': self.counts.n_cats_p2,
+            'winner': self.winner,
+            'finished_at': self.finished_at,
+            'promotions': list(map(lambda p: p.units, self.promotions)),
+            'board_data': encode_planes(self.board.planes()),
+            'board_json': None,
+        }
+
+
+    def save_move(
+        self,
+        x: int | None = None,
+        y: int | None = None,
+        is_cat: bool | None = None,
+        promotion: list[list[int]] | None = None,
+    ):
+        '''
+        logs the move which led to this state, and a snapshot every GAME_SNAPSHOT_INTERVAL moves
+        '''
+        Move.objects.create(game_id=self.id, ply=self.ply, x=x, y=y, is_cat=is_cat, promotion=promotion)
+        if self.ply % settings.GAME_SNAPSHOT_INTERVAL == 0:
+            self.snapshot().save()
+
+    def snapshot(self) -> GameSnapshot:
+        '''
+        the snapshot of this state, not saved
+        '''
+        return GameSnapshot(
+            game_id=self.id,
+            ply=self.ply,
             is_p1_turn=self.is_p1_turn,
             n_kittens_p1=self.counts.n_kittens_p1,
             n_cats_p1=self.counts.n_cats_p1,
             n_kittens_p2=self.counts.n_kittens_p2,
             n_cats_p2=self.counts.n_cats_p2,
-            winner=self.winner,
+            board_data=encode_planes(self.board.planes()),
             promotions=list(map(lambda p: p.units, self.promotions)),
-            board=self.board.value(),
+            winner=self.winner,
         )
-
@@ -107,3 +107,34 @@ class DiagonalOpportunities(Opportunities):
 
     def get_promotions(self) -> list[Promotion]:
         return self.promotions
+
+def scan_promotions(board, is_player1: bool) -> list[Promotion]:
+    '''
+    Former Board.look_for_promotions, kept as a reference for the windows masks
+    '''
+    opportunities: list[Opportunities] = [
+        ColumnOpportunities(),
+        LineOpportunities(),
+        DiagonalOpportunities(),
+    ]
+
+    for x in range(6):
+        if x not in board.board:
+            for o in opportunities:
+                o.empty_column()
+            continue
+        for o in opportunities:
+            o.new_column()
+        for y in range(6):
+            if y not in board.board[x] or board.board[x][y].is_player1 != is_player1:
+                for o in opportunities:
+                    o.empty_position(x, y)
+                continue
+            for o in opportunities:
+                o.new_position(x, y)
+
+    promotions = []
+    for o in opportunities:
+        promotions.extend(o.get_promotions())
+
+    return promotions
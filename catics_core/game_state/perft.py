@@ -0,0 +1,28 @@
+from .game_state import GameState
+
+def perft(state: GameState, depth: int) -> int:
+    '''
+    number of move sequences of length depth (shorter when the game ends) from this state
+    '''
+    if depth == 0 or state.winner != 'n':
+        return 1
+    moves = list(state.legal_moves())
+    if depth == 1:
+        return len(moves)
+    nodes = 0
+    for move in moves:
+        state.make_move(move)
+        nodes += perft(state, depth - 1)
+        state.unmake_move()
+    return nodes
+
+def divide(state: GameState, depth: int) -> dict[str, int]:
+    '''
+    perft of each legal move
+    '''
+    result = {}
+    for move in list(state.legal_moves()):
+        state.make_move(move)
+        result[repr(move)] = perft(state, depth - 1)
+        state.unmake_move()
+    return result
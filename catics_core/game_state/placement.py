@@ -0,0 +1,17 @@
+class Placement:
+    def __init__(self, x: int, y: int, is_cat: bool):
+        self.x = x
+        self.y = y
+        self.is_cat = is_cat
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Placement) \
+            and self.x == other.x \
+            and self.y == other.y \
+            and self.is_cat == other.is_cat
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y, self.is_cat))
+
+    def __repr__(self) -> str:
+        return '{}{}{}'.format(self.x, self.y, 'c' if self.is_cat else 'k')
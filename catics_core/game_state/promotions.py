@@ -1,7 +1,13 @@
-
 class Promotion:
     def __init__(self, units: list[tuple[int, int]]):
         self.units = units
 
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Promotion) \
+            and [tuple(u) for u in self.units] == [tuple(u) for u in other.units]
+
+    def __hash__(self) -> int:
+        return hash(tuple(tuple(u) for u in self.units))
+
     def __repr__(self) -> str:
         return 'Promotion{}'.format(self.units)
@@ -0,0 +1,77 @@
+from .promotions import Promotion
+
+def _windows() -> list[list[tuple[int, int]]]:
+    # same order as the former scanners: columns, lines, then diagonals
+    columns = []
+    lines = []
+    diagonals = []
+    for x in range(6):
+        for y in range(6):
+            if y >= 2:
+                columns.append([(x, y-2), (x, y-1), (x, y)])
+            if x >= 2:
+                lines.append([(x-2, y), (x-1, y), (x, y)])
+            if x >= 2 and y >= 2:
+                diagonals.append([(x, y), (x-1, y-1), (x-2, y-2)])
+            if x >= 2 and y <= 3:
+                diagonals.append([(x, y), (x-1, y+1), (x-2, y+2)])
+    return columns + lines + diagonals
+
+# every 3 in a row of the board, and its mask (bit x * 6 + y for (x, y))
+WINDOWS = tuple(tuple(w) for w in _windows())
+WINDOW_MASKS = tuple(sum(1 << (x * 6 + y) for (x, y) in w) for w in WINDOWS)
+# for every square, bit i is set when the square belongs to WINDOWS[i]
+SQUARE_WINDOWS = tuple(
+    sum(1 << i for (i, mask) in enumerate(WINDOW_MASKS) if mask & (1 << square))
+    for square in range(36)
+)
+
+def find_promotions(units: int) -> list[Promotion]:
+    '''
+    units: mask of the units of one player
+    '''
+    if units.bit_count() < 3:
+        return []
+    return [
+        Promotion(list(WINDOWS[i]))
+        for (i, mask) in enumerate(WINDOW_MASKS)
+        if units & mask == mask
+    ]
+
+class Lines:
+    '''
+    Complete windows of each player (bit i is set when WINDOWS[i] is complete),
+    only the windows crossing the squares that changed are evaluated again
+    '''
+
+    def __init__(self, p1_units: int, p2_units: int):
+        # indexed by is_player1
+        self.windows = [0, 0]
+        self.update((1 << 36) - 1, p1_units, p2_units)
+
+    def update(self, squares: int, p1_units: int, p2_units: int):
+        touched = 0
+        while squares:
+            lowest = squares & -squares
+            touched |= SQUARE_WINDOWS[lowest.bit_length() - 1]
+            squares ^= lowest
+
+        for (is_player1, units) in ((False, p2_units), (True, p1_units)):
+            windows = self.windows[is_player1] & ~touched
+            remaining = touched
+            while remaining:
+                lowest = remaining & -remaining
+                mask = WINDOW_MASKS[lowest.bit_length() - 1]
+                if units & mask == mask:
+                    windows |= lowest
+                remaining ^= lowest
+            self.windows[is_player1] = windows
+
+    def promotions(self, is_player1: bool) -> list[Promotion]:
+        promotions = []
+        windows = self.windows[is_player1]
+        while windows:
+            lowest = windows & -windows
+            promotions.append(Promotion(list(WINDOWS[lowest.bit_length() - 1])))
+            windows ^= lowest
+        return promotions
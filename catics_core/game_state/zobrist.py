@@ -0,0 +1,37 @@
+import random
+from .position import Position
+from .counts import Counts
+from .promotions import Promotion
+from .windows import WINDOWS
+
+# fixed seed: hashes are the same in every process
+_random = random.Random(0xCA71C5)
+
+def _key() -> int:
+    return _random.getrandbits(64)
+
+# indexed by x * 6 + y, then is_player1 * 2 + is_cat
+SQUARES = tuple(tuple(_key() for _ in range(4)) for _ in range(36))
+P1_TURN = _key()
+# one table per Counts field, indexed by the number of units (a player has 8 units)
+COUNTS = tuple(tuple(_key() for _ in range(9)) for _ in range(4))
+# three in a row promotions and single kitten promotions
+PROMOTIONS = {
+    **{ w: _key() for w in WINDOWS },
+    **{ ((x, y),): _key() for x in range(6) for y in range(6) },
+}
+
+def square_key(x: int, y: int, position: Position) -> int:
+    return SQUARES[x * 6 + y][position.is_player1 * 2 + position.is_cat]
+
+def counts_key(counts: Counts) -> int:
+    return COUNTS[0][counts.n_kittens_p1] \
+        ^ COUNTS[1][counts.n_cats_p1] \
+        ^ COUNTS[2][counts.n_kittens_p2] \
+        ^ COUNTS[3][counts.n_cats_p2]
+
+def promotions_key(promotions: list[Promotion]) -> int:
+    key = 0
+    for p in promotions:
+        key ^= PROMOTIONS[tuple(tuple(u) for u in p.units)]
+    return key
@@ -0,0 +1,56 @@
+import random
+from timeit import timeit
+from django.core.management.base import BaseCommand, CommandError
+from ...game_state import Board, BitBoard
+from ...game_state.opportunities import scan_promotions
+from ...game_state.windows import find_promotions
+
+def random_board(rng: random.Random, n_units: int) -> dict[int, dict[int, tuple[bool, bool]]]:
+    board = {}
+    for square in rng.sample(range(36), n_units):
+        (x, y) = divmod(square, 6)
+        if x not in board:
+            board[x] = {}
+        board[x][y] = [rng.random() < 0.5, rng.random() < 0.5]
+    return board
+
+class Command(BaseCommand):
+    help = 'Compares the promotions scanners with the precomputed windows on random boards'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--boards', type=int, default=1000)
+        parser.add_argument('-r', '--repeat', type=int, default=10)
+        parser.add_argument('-s', '--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        values = [random_board(rng, rng.randint(0, 16)) for _ in range(options['boards'])]
+        boards = [Board(v) for v in values]
+        bit_boards = [BitBoard(v) for v in values]
+        players = [b.players() for b in bit_boards]
+
+        for (board, bit_board) in zip(boards, bit_boards):
+            for is_player1 in (True, False):
+                expected = [p.units for p in scan_promotions(board, is_player1)]
+                if [p.units for p in board.look_for_promotions(is_player1)] != expected \
+                        or [p.units for p in bit_board.look_for_promotions(is_player1)] != expected:
+                    raise CommandError('promotions mismatch on {}'.format(board))
+
+        n_calls = 2 * len(values) * options['repeat']
+        results = [
+            ('scanners', timeit(
+                lambda: [scan_promotions(b, p) for b in boards for p in (True, False)],
+                number=options['repeat'],
+            )),
+            ('windows', timeit(
+                lambda: [find_promotions(units) for p in players for units in p],
+                number=options['repeat'],
+            )),
+        ]
+        reference = results[0][1]
+        for (name, duration) in results:
+            self.stdout.write('{:<20}{:>10.2f} µs/call{:>8.1f}x'.format(
+                name,
+                duration / n_calls * 1e6,
+                reference / duration,
+            ))
@@ -0,0 +1,51 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from os import cpu_count
+from time import sleep
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ...matchmaking import MatchScheduler
+
+class Command(BaseCommand):
+    help = 'Pairs the latest versions of the agents and plays their games in a process pool, ' \
+        + 'the results are saved in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-w', '--workers', type=int, default=cpu_count())
+        parser.add_argument('--owner-limit', type=int, default=settings.MATCHMAKING_OWNER_LIMIT)
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--interval', type=float, default=5, help='seconds between two saves')
+        parser.add_argument('--max-plies', type=int, default=settings.MATCHMAKING_MAX_PLIES)
+        parser.add_argument('-s', '--seed', type=int, default=0)
+        parser.add_argument('-n', '--games', type=int, default=0, help='stop after this many games')
+
+    def handle(self, *args, **options):
+        if options['workers'] > 1:
+            executor = ProcessPoolExecutor(options['workers'], initializer=django.setup)
+        else:
+            executor = ThreadPoolExecutor(1)
+        scheduler = MatchScheduler(
+            executor,
+            options['workers'],
+            owner_limit=options['owner_limit'],
+            batch_size=options['batch_size'],
+            flush_interval=options['interval'],
+            max_plies=options['max_plies'],
+            seed=options['seed'],
+        )
+        n_games = 0
+        try:
+            while options['games'] == 0 or n_games < options['games']:
+                n_ended = scheduler.step(options['interval'])
+                n_games += n_ended
+                for (game_id, error) in scheduler.errors:
+                    self.stderr.write('game {}: {}'.format(game_id, error))
+                scheduler.errors = []
+                if n_ended == 0 and len(scheduler.running) == 0:
+                    # less than two agents
+                    sleep(options['interval'])
+        finally:
+            # the games still running are played again by the next run
+            scheduler.flush()
+            executor.shutdown(cancel_futures=True)
+        self.stdout.write('{} games played'.format(n_games))
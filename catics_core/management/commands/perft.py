@@ -0,0 +1,41 @@
+from time import perf_counter
+from django.core.management.base import BaseCommand, CommandError
+from ...models import Game
+from ...game_state import GameState, Board, BitBoard
+from ...game_state.perft import perft, divide
+
+BOARDS = { 'board': Board, 'bitboard': BitBoard }
+
+class Command(BaseCommand):
+    help = 'Counts the leaves of the move tree, to check and time the rules engine'
+
+    def add_arguments(self, parser):
+        parser.add_argument('depth', type=int)
+        parser.add_argument('-g', '--game', type=int, help='start from this game instead of an empty board')
+        parser.add_argument('-b', '--board', choices=BOARDS.keys(), default='bitboard')
+        parser.add_argument('-d', '--divide', action='store_true', help='count the leaves of each move')
+
+    def handle(self, *args, **options):
+        if options['game'] is None:
+            game = Game()
+        else:
+            try:
+                game = Game.objects.get(id=options['game'])
+            except Game.DoesNotExist:
+                raise CommandError('game {} not found'.format(options['game']))
+        state = GameState(game, BOARDS[options['board']])
+
+        if options['divide']:
+            for (move, nodes) in divide(state, options['depth']).items():
+                self.stdout.write('{}: {}'.format(move, nodes))
+
+        for depth in range(1, options['depth'] + 1):
+            start = perf_counter()
+            nodes = perft(state, depth)
+            duration = perf_counter() - start
+            self.stdout.write('depth {:<3}{:>14} nodes{:>10.2f} s{:>12.0f} nodes/s'.format(
+                depth,
+                nodes,
+                duration,
+                nodes / duration if duration > 0 else 0,
+            ))
@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from time import perf_counter
+import django
+from django.core.management.base import BaseCommand
+from ...models import MatchResult
+from ...strategies import STRATEGIES, MonteCarloStrategy, Strategy, play_match
+
+def nodes_per_second(strategy: Strategy) -> float | None:
+    '''
+    of all the searches of the match, None for the strategies which do not count their nodes
+    '''
+    if not isinstance(strategy, MonteCarloStrategy) or strategy.search_time == 0:
+        return None
+    return strategy.n_nodes / strategy.search_time
+
+def play(
+    args: tuple[str, str, int, int, bool, dict],
+) -> tuple[str, str, str, int, list | None, tuple[float | None, float | None]]:
+    (player1, player2, seed, max_plies, with_moves, strategy_options) = args
+    strategies = (
+        STRATEGIES[player1](seed, **strategy_options.get(player1, {})),
+        STRATEGIES[player2](seed + 1, **strategy_options.get(player2, {})),
+    )
+    try:
+        (winner, n_plies, moves) = play_match(*strategies, max_plies, with_moves)
+    finally:
+        for strategy in strategies:
+            strategy.close()
+    return (player1, player2, winner, n_plies, moves, tuple(nodes_per_second(s) for s in strategies))
+
+class Command(BaseCommand):
+    help = 'Plays games between two strategies in memory and saves their results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('strategy1', choices=STRATEGIES.keys())
+        parser.add_argument('strategy2', choices=STRATEGIES.keys())
+        parser.add_argument('-n', '--games', type=int, default=100)
+        parser.add_argument('-w', '--workers', type=int, default=cpu_count())
+        parser.add_argument('-s', '--seed', type=int, default=0)
+        parser.add_argument('--max-plies', type=int, default=500)
+        parser.add_argument('--moves', action='store_true', help='save the moves of each game')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--simulations', type=int, default=1000, help='of mcts, per move')
+        parser.add_argument(
+            '--mcts-workers',
+            type=int,
+            default=1,
+            help='processes of each mcts search, the games already run on --workers processes',
+        )
+
+    def handle(self, *args, **options):
+        strategy_options = {
+            'mcts': { 'n_simulations': options['simulations'], 'workers': options['mcts_workers'] },
+        }
+        # strategies swap sides every game
+        matches = [
+            (
+                options['strategy1'] if i % 2 == 0 else options['strategy2'],
+                options['strategy2'] if i % 2 == 0 else options['strategy1'],
+                options['seed'] + 2 * i,
+                options['max_plies'],
+                options['moves'],
+                strategy_options,
+            )
+            for i in range(options['games'])
+        ]
+
+        start = perf_counter()
+        if options['workers'] > 1:
+            executor = ProcessPoolExecutor(options['workers'], initializer=django.setup)
+            results = executor.map(
+                play,
+                matches,
+                chunksize=max(1, len(matches) // (options['workers'] * 4)),
+            )
+        else:
+            executor = None
+            results = map(play, matches)
+
+        wins = { options['strategy1']: 0, options['strategy2']: 0 }
+        n_draws = 0
+        n_plies = 0
+        batch = []
+        for (i, (player1, player2, winner, plies, moves, rates)) in enumerate(results):
+            for (name, rate) in zip((player1, player2), rates):
+                if rate is not None:
+                    self.stdout.write('game {}: {} {:.0f} nodes/s'.format(i, name, rate))
+            if winner == 'n':
+                n_draws += 1
+            else:
+                wins[player1 if winner == '1' else player2] += 1
+            n_plies += plies
+            batch.append(MatchResult(
+                player1=player1,
+                player2=player2,
+                winner=winner,
+                n_plies=plies,
+                moves=moves,
+            ))
+            if len(batch) >= options['batch_size']:
+                MatchResult.objects.bulk_create(batch)
+                batch = []
+        MatchResult.objects.bulk_create(batch)
+        if executor is not None:
+            executor.shutdown()
+        duration = perf_counter() - start
+
+        self.stdout.write('{} games in {:.2f} s ({:.0f} plies/s)'.format(
+            len(matches),
+            duration,
+            n_plies / duration if duration > 0 else 0,
+        ))
+        if options['strategy1'] == options['strategy2']:
+            self.stdout.write('{}: {} wins'.format(options['strategy1'], sum(wins.values())))
+        else:
+            for (name, n_wins) in wins.items():
+                self.stdout.write('{}: {} wins'.format(name, n_wins))
+        self.stdout.write('draws: {}'.format(n_draws))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...models import Game, Rating
+from ...ratings import is_rated, apply_result
+
+class Command(BaseCommand):
+    help = 'Rebuilds the ratings from all the finished games, in the order they ended, ' \
+        + 'the games are read chunk by chunk (the games which end meanwhile are not counted)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        ratings = {}
+        n_games = 0
+        games = Game.objects.filter(finished_at__isnull=False) \
+            .order_by('finished_at', 'id') \
+            .values_list('player1_type_id', 'player1_id', 'player2_type_id', 'player2_id', 'winner') \
+            .iterator(chunk_size=options['chunk_size'])
+        for (player1_type_id, player1_id, player2_type_id, player2_id, winner) in games:
+            players = ((player1_type_id, player1_id), (player2_type_id, player2_id))
+            if not is_rated(players):
+                continue
+            for (player_type_id, player_id) in players:
+                if (player_type_id, player_id) not in ratings:
+                    ratings[(player_type_id, player_id)] = Rating(player_type_id=player_type_id, player_id=player_id)
+            apply_result(ratings[players[0]], ratings[players[1]], winner)
+            n_games += 1
+
+        with transaction.atomic():
+            Rating.objects.all().delete()
+            Rating.objects.bulk_create(ratings.values(), batch_size=options['chunk_size'])
+        self.stdout.write('{} players rated from {} games'.format(len(ratings), n_games))
@@ -0,0 +1,99 @@
+import random
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.urls import reverse
+from knox.models import AuthToken
+from rest_framework.test import APIClient
+from ...game_state import GameState, BitBoard, Placement
+from ...models import Game
+from ...stats import request_stats
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = 'Plays random games through the API, then prints the percentiles of the queries ' \
+        + 'and times of each endpoint recorded by QueryStatsMiddleware. Nothing is saved'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--games', type=int, default=10)
+        parser.add_argument('-s', '--seed', type=int, default=0)
+        parser.add_argument('--max-plies', type=int, default=200)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        host = self.host()
+        request_stats.clear()
+        with transaction.atomic():
+            clients = []
+            for i in range(2):
+                user = User.objects.create_user(
+                    username='request_stats_{}'.format(i),
+                    email='request_stats_{}@catics.fr'.format(i),
+                    is_validated=True,
+                )
+                client = APIClient(HTTP_HOST=host)
+                client.credentials(HTTP_AUTHORIZATION='Token ' + AuthToken.objects.create(user)[1])
+                clients.append((user, client))
+            for _ in range(options['games']):
+                self.play(clients, rng, options['max_plies'])
+            transaction.set_rollback(True)
+
+        stats = request_stats.percentiles()
+        if len(stats) == 0:
+            raise CommandError('no request recorded, is QueryStatsMiddleware in MIDDLEWARE ?')
+        self.stdout.write('{:<28} {:>6}   {:<22} {:<30} {:<30} {}'.format(
+            'endpoint', 'count', 'queries p50/p90/p99/max', 'db ms', 'python ms', 'wait ms',
+        ))
+        for (endpoint, values) in stats.items():
+            self.stdout.write('{:<28} {:>6}   {:<22} {:<30} {:<30} {}'.format(
+                endpoint,
+                values['count'],
+                '/'.join(str(n) for n in values['n_queries']),
+                '/'.join('{:.2f}'.format(t * 1000) for t in values['db_time']),
+                '/'.join('{:.2f}'.format(t * 1000) for t in values['python_time']),
+                '/'.join('{:.2f}'.format(t * 1000) for t in values['wait_time']),
+            ))
+
+    def host(self) -> str:
+        '''
+        a host the requests are accepted for, the settings are left as they are
+        '''
+        if len(settings.ALLOWED_HOSTS) == 0:
+            if not settings.DEBUG:
+                raise CommandError('ALLOWED_HOSTS is empty, no request would be accepted')
+            # what django accepts then
+            return 'localhost'
+        host = settings.ALLOWED_HOSTS[0]
+        if host == '*':
+            return 'localhost'
+        # a subdomain pattern accepts the domain itself
+        return host.lstrip('.')
+
+    def play(self, clients: list[tuple], rng: random.Random, max_plies: int):
+        ((player1, client1), (player2, client2)) = clients
+        response = client1.put(reverse('core-game'), { 'player2_user': player2.id })
+        game_id = response.data['id']
+        for _ in range(max_plies):
+            client = client1 if client1.get(reverse('core-game'), { 'id': game_id }).data.get('is_p1_turn') \
+                else client2
+            # outside of the requests, so it is not recorded
+            state = GameState(Game.objects.get(id=game_id), BitBoard)
+            moves = list(state.legal_moves())
+            if len(moves) == 0:
+                return
+            move = rng.choice(moves)
+            if isinstance(move, Placement):
+                response = client.post(
+                    reverse('core-play'),
+                    { 'game': game_id, 'x': move.x, 'y': move.y, 'is_cat': move.is_cat },
+                )
+            else:
+                response = client.post(
+                    reverse('core-promote'),
+                    { 'game': game_id, 'units': [list(u) for u in move.units] },
+                    format='json',
+                )
+            if response.status_code != 200:
+                raise CommandError(response.data)
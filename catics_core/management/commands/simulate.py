@@ -0,0 +1,67 @@
+from time import perf_counter
+from django.core.management.base import BaseCommand, CommandError
+from ...game_state import GameState, BitBoard
+from ...game_state.batch import BatchSimulator
+from ...models import Game
+
+WINNERS = ('n', '1', '2')
+
+def replay(simulator: BatchSimulator, game: int) -> GameState:
+    state = GameState(Game(), BitBoard)
+    for move in simulator.moves(game):
+        state.make_move(move)
+    return state
+
+def mismatch(simulator: BatchSimulator, game: int) -> bool:
+    '''
+    True when the state of the simulator differs from GameState playing the same moves
+    '''
+    state = replay(simulator, game)
+    counts = state.counts
+    return tuple(state.board.units) != tuple(int(u) for u in simulator.units[game]) \
+        or (counts.n_kittens_p2, counts.n_cats_p2, counts.n_kittens_p1, counts.n_cats_p1) \
+            != tuple(int(n) for n in simulator.hands[game]) \
+        or state.winner != WINNERS[simulator.winner[game]] \
+        or state.ply != simulator.ply[game] \
+        or state.is_p1_turn != simulator.is_p1_turn[game]
+
+class Command(BaseCommand):
+    help = 'Plays random games on NumPy arrays, checks some of them against GameState, ' \
+        + 'and compares the plies per second of both'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--games', type=int, default=10000)
+        parser.add_argument('-s', '--seed', type=int, default=0)
+        parser.add_argument('--max-plies', type=int, default=500)
+        parser.add_argument('--verify', type=int, default=100, help='number of games replayed by GameState')
+
+    def handle(self, *args, **options):
+        simulator = BatchSimulator(options['games'], options['seed'], options['max_plies'], record=True)
+        start = perf_counter()
+        n_plies = simulator.run()
+        duration = perf_counter() - start
+
+        n_verified = min(options['verify'], options['games'])
+        start = perf_counter()
+        n_replayed = 0
+        for game in range(n_verified):
+            if mismatch(simulator, game):
+                raise CommandError('game {} differs from GameState'.format(game))
+            n_replayed += int(simulator.ply[game])
+        replay_duration = perf_counter() - start
+
+        self.stdout.write('{} games, {} plies, player 1: {}, player 2: {}, unfinished: {}'.format(
+            options['games'],
+            n_plies,
+            int((simulator.winner == 1).sum()),
+            int((simulator.winner == 2).sum()),
+            int((simulator.winner == 0).sum()),
+        ))
+        self.stdout.write('{:<12}{:>12.0f} plies/s'.format('batch', n_plies / duration))
+        if n_replayed > 0:
+            # the replay includes the conversion of the moves
+            self.stdout.write('{:<12}{:>12.0f} plies/s ({} games verified)'.format(
+                'GameState',
+                n_replayed / replay_duration,
+                n_verified,
+            ))
@@ -0,0 +1,234 @@
+import random
+from collections import Counter
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from time import monotonic
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from .game_state import GameState, BitBoard, Placement
+from .models import AgentVersion, Game, Move, GameSnapshot
+from .ratings import record_results
+from .runtime.exceptions import AgentFailedException, AgentInvalidMoveException
+from .strategies import WasmStrategy
+
+GAME_FIELDS = [
+    'version',
+    'ply',
+    'is_p1_turn',
+    'n_kittens_p1',
+    'n_cats_p1',
+    'n_kittens_p2',
+    'n_cats_p2',
+    'winner',
+    'finished_at',
+    'promotions',
+    'board_data',
+    'board_json',
+]
+
+def latest_versions() -> list[AgentVersion]:
+    '''
+    the latest version of every agent, without their modules
+    '''
+    latest = AgentVersion.objects.filter(agent=OuterRef('agent')).order_by('-number', '-id').values('id')[:1]
+    return list(
+        AgentVersion.objects.filter(id=Subquery(latest)).select_related('agent').defer('wasm').order_by('id')
+    )
+
+def agent_games():
+    '''
+    the games between two agents
+    '''
+    content_type = ContentType.objects.get_for_model(AgentVersion)
+    return Game.objects.filter(player1_type=content_type, player2_type=content_type)
+
+def create_games(n_games: int, rng: random.Random) -> list[Game]:
+    '''
+    games between the latest versions which played the least against each other,
+    each one is player 1 as often as the other
+    '''
+    ids = [v.id for v in latest_versions()]
+    played = Counter({
+        (row['player1_id'], row['player2_id']): row['n']
+        for row in agent_games().filter(player1_id__in=ids, player2_id__in=ids)
+            .values('player1_id', 'player2_id')
+            .annotate(n=Count('id'))
+    })
+    pairs = [(a, b) for (i, a) in enumerate(ids) for b in ids[i + 1:]]
+    rng.shuffle(pairs)
+    pairs.sort(key=lambda p: played[p] + played[p[::-1]])
+
+    content_type = ContentType.objects.get_for_model(AgentVersion)
+    games = []
+    for (a, b) in pairs[:n_games]:
+        if played[(a, b)] > played[(b, a)]:
+            (a, b) = (b, a)
+        games.append(Game(player1_type=content_type, player1_id=a, player2_type=content_type, player2_id=b))
+    return Game.objects.bulk_create(games)
+
+def play_game(
+    game: Game,
+    version1: AgentVersion,
+    version2: AgentVersion,
+    max_plies: int,
+) -> tuple[GameState, list[Move], list[GameSnapshot], str | None]:
+    '''
+    plays the game until its end or max_plies, in a worker: nothing is read from or written to
+    the database, returns the state, the moves and snapshots to save, and the error of the agent
+    which could not play (it loses)
+    '''
+    state = GameState(game, BitBoard)
+    strategies = (WasmStrategy(version1), WasmStrategy(version2))
+    moves = []
+    snapshots = []
+    error = None
+    while state.winner == 'n' and state.ply < max_plies:
+        try:
+            move = strategies[not state.is_p1_turn].choose(state)
+        except (AgentFailedException, AgentInvalidMoveException) as e:
+            error = str(e.detail)
+            state.winner = '2' if state.is_p1_turn else '1'
+            break
+        state.make_move(move)
+        state.history.clear()
+        if isinstance(move, Placement):
+            moves.append(Move(game_id=game.id, ply=state.ply, x=move.x, y=move.y, is_cat=move.is_cat))
+        else:
+            moves.append(Move(game_id=game.id, ply=state.ply, promotion=[list(u) for u in move.units]))
+        if state.ply % settings.GAME_SNAPSHOT_INTERVAL == 0:
+            snapshots.append(state.snapshot())
+    return (state, moves, snapshots, error)
+
+class MatchScheduler:
+    '''
+    Plays the unfinished games between agents in the executor, creates new ones when there are not
+    enough, at most owner_limit games of the agents of an owner run at once,
+    the results are saved batch_size games at a time, or after flush_interval seconds
+
+    only one scheduler must run, the games it plays are saved without checking their version
+    '''
+
+    def __init__(
+        self,
+        executor: Executor,
+        n_workers: int,
+        owner_limit: int = settings.MATCHMAKING_OWNER_LIMIT,
+        batch_size: int = 100,
+        flush_interval: float = 5,
+        max_plies: int = settings.MATCHMAKING_MAX_PLIES,
+        seed: int = 0,
+    ):
+        self.executor = executor
+        self.n_workers = n_workers
+        self.owner_limit = owner_limit
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.flushed_at = monotonic()
+        self.max_plies = max_plies
+        self.rng = random.Random(seed)
+        # games waiting for a worker, with their versions
+        self.queue: list[tuple[Game, AgentVersion, AgentVersion]] = []
+        self.running: dict[Future, tuple[Game, set[int]]] = {}
+        # owner id -> number of running games
+        self.owners = Counter()
+        # finished (or failed) games waiting to be saved
+        self.results: list[tuple[Game, GameState, list[Move], list[GameSnapshot]]] = []
+        self.errors: list[tuple[int, str]] = []
+
+    def refill(self):
+        '''
+        queues the unfinished games, and new games when there are not enough of them
+        '''
+        n_missing = 2 * self.n_workers - len(self.queue)
+        if n_missing <= 0:
+            return
+        busy = [g.id for (g, _, _) in self.queue] \
+            + [g.id for (g, _) in self.running.values()] \
+            + [g.id for (g, _, _, _) in self.results]
+        games = list(
+            agent_games()
+                .filter(winner='n', ply__lt=self.max_plies)
+                .exclude(id__in=busy)
+                .order_by('id')[:n_missing]
+        )
+        if len(games) < n_missing:
+            games += create_games(n_missing - len(games), self.rng)
+        versions = AgentVersion.objects.select_related('agent').in_bulk(
+            { g.player1_id for g in games } | { g.player2_id for g in games }
+        )
+        for game in games:
+            if game.player1_id in versions and game.player2_id in versions:
+                self.queue.append((game, versions[game.player1_id], versions[game.player2_id]))
+
+    def submit(self):
+        '''
+        runs the queued games whose owners are below the limit, oldest first
+        '''
+        waiting = []
+        for (game, version1, version2) in self.queue:
+            owners = { version1.agent.owner_id, version2.agent.owner_id }
+            if len(self.running) >= self.n_workers or any(self.owners[o] >= self.owner_limit for o in owners):
+                waiting.append((game, version1, version2))
+                continue
+            future = self.executor.submit(play_game, game, version1, version2, self.max_plies)
+            self.running[future] = (game, owners)
+            self.owners.update(owners)
+        self.queue = waiting
+
+    def collect(self, timeout: float | None) -> int:
+        '''
+        waits for at least one running game, returns the number of games which ended
+        '''
+        if len(self.running) == 0:
+            return 0
+        (done, _) = wait(self.running, timeout, FIRST_COMPLETED)
+        for future in done:
+            (game, owners) = self.running.pop(future)
+            self.owners.subtract(owners)
+            (state, moves, snapshots, error) = future.result()
+            self.results.append((game, state, moves, snapshots))
+            if error is not None:
+                self.errors.append((game.id, error))
+        return len(done)
+
+    def flush(self) -> int:
+        '''
+        saves the results, returns the number of games saved
+        '''
+        self.flushed_at = monotonic()
+        if len(self.results) == 0:
+            return 0
+        games = []
+        moves = []
+        snapshots = []
+        finished = []
+        for (game, state, game_moves, game_snapshots) in self.results:
+            if state.finish():
+                finished.append((state.players, state.winner))
+            for (field, value) in state.fields().items():
+                setattr(game, field, value)
+            game.version += 1
+            games.append(game)
+            moves += game_moves
+            snapshots += game_snapshots
+        with transaction.atomic():
+            Game.objects.bulk_update(games, GAME_FIELDS)
+            Move.objects.bulk_create(moves)
+            GameSnapshot.objects.bulk_create(snapshots)
+            record_results(finished)
+        self.results = []
+        return len(games)
+
+    def step(self, timeout: float | None = None) -> int:
+        '''
+        returns the number of games which ended, 0 when there is nothing to play
+        '''
+        self.refill()
+        self.submit()
+        n_ended = self.collect(timeout)
+        if len(self.results) >= self.batch_size \
+                or len(self.running) == 0 \
+                or monotonic() - self.flushed_at >= self.flush_interval:
+            self.flush()
+        return n_ended
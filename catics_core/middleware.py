@@ -0,0 +1,40 @@
+from time import perf_counter
+from django.db import connection
+from .stats import RequestSample, current, request_stats
+
+class QueryStatsMiddleware:
+    '''
+    records the number of queries, the database time, the python time and the wait time of every
+    request, the queries and the waits are not counted in the python time
+    '''
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = RequestSample('', 0, 0, 0)
+
+        def execute(execute, sql, params, many, context):
+            start = perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                sample.n_queries += 1
+                sample.db_time += perf_counter() - start
+
+        start = perf_counter()
+        current.sample = sample
+        try:
+            with connection.execute_wrapper(execute):
+                response = self.get_response(request)
+        finally:
+            current.sample = None
+        sample.python_time = perf_counter() - start - sample.db_time - sample.wait_time
+
+        match = request.resolver_match
+        sample.endpoint = '{} {}'.format(
+            request.method,
+            match.view_name if match is not None else 'unresolved',
+        )
+        request_stats.add(sample)
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('player1', models.CharField(max_length=200)),
+                ('player2', models.CharField(max_length=200)),
+                ('winner', models.CharField(choices=[('n', 'nobody'), ('1', 'player 1'), ('2', 'player 2')], default='n', max_length=1)),
+                ('n_plies', models.PositiveIntegerField()),
+                ('moves', models.JSONField(null=True)),
+            ],
+        ),
+    ]
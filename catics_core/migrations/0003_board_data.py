@@ -0,0 +1,68 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:20
+
+from django.db import migrations, models
+from catics_core.models.board_encoding import BOARD_DATA_SIZE, EMPTY_BOARD_DATA, \
+    encode_planes, \
+    decode_planes, \
+    planes_from_value, \
+    value_from_planes
+
+BATCH_SIZE = 1000
+
+
+def encode_boards(apps, schema_editor):
+    Game = apps.get_model('catics_core', 'Game')
+    batch = []
+    games = Game.objects.filter(board_data__isnull=True).only('id', 'board_json')
+    for game in games.iterator(chunk_size=BATCH_SIZE):
+        game.board_data = encode_planes(planes_from_value(game.board_json or {}))
+        game.board_json = None
+        batch.append(game)
+        if len(batch) >= BATCH_SIZE:
+            Game.objects.bulk_update(batch, ['board_data', 'board_json'])
+            batch = []
+    Game.objects.bulk_update(batch, ['board_data', 'board_json'])
+
+
+def decode_boards(apps, schema_editor):
+    Game = apps.get_model('catics_core', 'Game')
+    batch = []
+    games = Game.objects.filter(board_data__isnull=False).only('id', 'board_data')
+    for game in games.iterator(chunk_size=BATCH_SIZE):
+        game.board_json = value_from_planes(decode_planes(bytes(game.board_data)))
+        batch.append(game)
+        if len(batch) >= BATCH_SIZE:
+            Game.objects.bulk_update(batch, ['board_json'])
+            batch = []
+    Game.objects.bulk_update(batch, ['board_json'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_core', '0002_matchresult'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='game',
+            name='board',
+            field=models.JSONField(db_column='board', default=None, null=True),
+        ),
+        migrations.RenameField(
+            model_name='game',
+            old_name='board',
+            new_name='board_json',
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='board_data',
+            field=models.BinaryField(max_length=BOARD_DATA_SIZE, null=True),
+        ),
+        migrations.RunPython(encode_boards, decode_boards),
+        migrations.AlterField(
+            model_name='game',
+            name='board_data',
+            field=models.BinaryField(default=EMPTY_BOARD_DATA, max_length=BOARD_DATA_SIZE, null=True),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_core', '0003_board_data'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='ply',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='GameSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ply', models.PositiveIntegerField()),
+                ('is_p1_turn', models.BooleanField()),
+                ('n_kittens_p1', models.PositiveIntegerField()),
+                ('n_cats_p1', models.PositiveIntegerField()),
+                ('n_kittens_p2', models.PositiveIntegerField()),
+                ('n_cats_p2', models.PositiveIntegerField()),
+                ('board_data', models.BinaryField(max_length=14)),
+                ('promotions', models.JSONField(default=list)),
+                ('winner', models.CharField(max_length=1)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='catics_core.game')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'ply'), name='unique_snapshot_ply')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Move',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ply', models.PositiveIntegerField()),
+                ('x', models.PositiveSmallIntegerField(null=True)),
+                ('y', models.PositiveSmallIntegerField(null=True)),
+                ('is_cat', models.BooleanField(null=True)),
+                ('promotion', models.JSONField(null=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='moves', to='catics_core.game')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('game', 'ply'), name='unique_move_ply')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_core', '0005_game_version'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='agentversion',
+            index=models.Index(fields=['agent', 'number'], name='agent_version_number'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['player1_type', 'player2_type', 'winner'], name='game_player_types_winner'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.3 on 2026-10-18 16:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def set_finished_at(apps, schema_editor):
+    # the games finished before this field existed were not modified since
+    Game = apps.get_model('catics_core', 'Game')
+    Game.objects.exclude(winner='n').update(finished_at=models.F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catics_core', '0006_matchmaking_indexes'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Rating',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('player_id', models.PositiveBigIntegerField()),
+                ('rating', models.FloatField(default=1500)),
+                ('n_games', models.PositiveIntegerField(default=0)),
+                ('n_wins', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='finished_at',
+            field=models.DateTimeField(default=None, null=True),
+        ),
+        migrations.RunPython(set_finished_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['finished_at', 'id'], name='game_finished_at'),
+        ),
+        migrations.AddField(
+            model_name='rating',
+            name='player_type',
+            field=models.ForeignKey(limit_choices_to={'model__in': ['user', 'agentversion']}, on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype'),
+        ),
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['player_type', '-rating'], name='rating_leaderboard'),
+        ),
+        migrations.AddConstraint(
+            model_name='rating',
+            constraint=models.UniqueConstraint(fields=('player_type', 'player_id'), name='unique_rating_player'),
+        ),
+    ]
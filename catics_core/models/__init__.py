@@ -1,3 +1,7 @@
 from .agent import Agent
 from .agent_version import AgentVersion
 from .game import Game
+from .move import Move
+from .game_snapshot import GameSnapshot
+from .match_result import MatchResult
+from .rating import Rating
@@ -3,6 +3,11 @@ from django.conf import settings
 from . import Agent
 
 class AgentVersion(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['agent', 'number'], name='agent_version_number'),
+        ]
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     agent = models.ForeignKey(Agent, on_delete=models.CASCADE)
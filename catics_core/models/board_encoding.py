@@ -0,0 +1,47 @@
+'''
+Compact storage of the board: three 36 bits planes (bit x * 6 + y for (x, y)), the occupied
+squares, the units of player 1 and the cats, in BOARD_DATA_SIZE little endian bytes.
+
+Boards are handled as planes of units indexed by is_player1 * 2 + is_cat
+(p2 kittens, p2 cats, p1 kittens, p1 cats).
+'''
+
+BOARD_DATA_SIZE = 14
+EMPTY_BOARD_DATA = bytes(BOARD_DATA_SIZE)
+
+def encode_planes(planes: tuple[int, int, int, int]) -> bytes:
+    occupied = planes[0] | planes[1] | planes[2] | planes[3]
+    player1 = planes[2] | planes[3]
+    cats = planes[1] | planes[3]
+    return (occupied | player1 << 36 | cats << 72).to_bytes(BOARD_DATA_SIZE, 'little')
+
+def decode_planes(data: bytes) -> tuple[int, int, int, int]:
+    value = int.from_bytes(data, 'little')
+    occupied = value & 0xfffffffff
+    player1 = (value >> 36) & occupied
+    cats = (value >> 72) & occupied
+    player2 = occupied & ~player1
+    return (player2 & ~cats, player2 & cats, player1 & ~cats, player1 & cats)
+
+def planes_from_value(value: dict) -> tuple[int, int, int, int]:
+    '''
+    value: the former JSON board, {x: {y: [is_player1, is_cat]}}
+    '''
+    planes = [0, 0, 0, 0]
+    for (x, column) in value.items():
+        for (y, position) in column.items():
+            planes[position[0] * 2 + position[1]] |= 1 << (int(x) * 6 + int(y))
+    return tuple(planes)
+
+def value_from_planes(planes: tuple[int, int, int, int]) -> dict[int, dict[int, list[bool]]]:
+    value = {}
+    for x in range(6):
+        for y in range(6):
+            bit = 1 << (x * 6 + y)
+            for i in range(4):
+                if planes[i] & bit:
+                    if x not in value:
+                        value[x] = {}
+                    value[x][y] = [i >= 2, i & 1 == 1]
+                    break
+    return value
@@ -2,8 +2,21 @@ from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from .board_encoding import BOARD_DATA_SIZE, EMPTY_BOARD_DATA, \
+    encode_planes, \
+    decode_planes, \
+    planes_from_value, \
+    value_from_planes
 
 class Game(models.Model):
+    class Meta:
+        indexes = [
+            # the unfinished games between agents, see matchmaking
+            models.Index(fields=['player1_type', 'player2_type', 'winner'], name='game_player_types_winner'),
+            # the finished games in the order of the ratings updates, see recompute_ratings
+            models.Index(fields=['finished_at', 'id'], name='game_finished_at'),
+        ]
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -28,6 +41,10 @@ class Game(models.Model):
     player2_object = GenericForeignKey('player2_type', 'player2_id')
 
     is_p1_turn = models.BooleanField(default=True)
+    # number of moves played, see Move
+    ply = models.PositiveIntegerField(default=0)
+    # incremented on every write, it is the ETag of the game
+    version = models.PositiveIntegerField(default=0)
 
     n_kittens_p1 = models.PositiveIntegerField(default=8)
     n_cats_p1 = models.PositiveIntegerField(default=0)
@@ -35,7 +52,9 @@ class Game(models.Model):
     n_kittens_p2 = models.PositiveIntegerField(default=8)
     n_cats_p2 = models.PositiveIntegerField(default=0)
 
-    board = models.JSONField(default=dict)
+    # see board_encoding, board_json is only read for rows written before board_data existed
+    board_data = models.BinaryField(max_length=BOARD_DATA_SIZE, null=True, default=EMPTY_BOARD_DATA)
+    board_json = models.JSONField(db_column='board', null=True, default=None)
 
     promotions = models.JSONField(default=list)
 
@@ -44,6 +63,32 @@ class Game(models.Model):
         max_length=1,
         default='n',
     )
+    # set with the winner
+    finished_at = models.DateTimeField(null=True, default=None)
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            self.version += 1
+        super().save(*args, **kwargs)
+
+    @property
+    def board_planes(self) -> tuple[int, int, int, int]:
+        if self.board_data is None:
+            return planes_from_value(self.board_json or {})
+        return decode_planes(bytes(self.board_data))
+
+    @board_planes.setter
+    def board_planes(self, planes: tuple[int, int, int, int]):
+        self.board_data = encode_planes(planes)
+        self.board_json = None
+
+    @property
+    def board(self) -> dict[int, dict[int, list[bool]]]:
+        return value_from_planes(self.board_planes)
+
+    @board.setter
+    def board(self, value: dict):
+        self.board_planes = planes_from_value(value)
 
     def clean(self):
         if self.player1_type.model not in ['User', 'AgentVersion']:
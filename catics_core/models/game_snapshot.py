@@ -0,0 +1,28 @@
+from django.db import models
+from . import Game
+from .board_encoding import BOARD_DATA_SIZE, decode_planes
+
+class GameSnapshot(models.Model):
+    '''
+    The state of a game after its ply-th move, every GAME_SNAPSHOT_INTERVAL moves,
+    so a state can be rebuilt without replaying the whole game
+    '''
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'ply'], name='unique_snapshot_ply'),
+        ]
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='snapshots')
+    ply = models.PositiveIntegerField()
+    is_p1_turn = models.BooleanField()
+    n_kittens_p1 = models.PositiveIntegerField()
+    n_cats_p1 = models.PositiveIntegerField()
+    n_kittens_p2 = models.PositiveIntegerField()
+    n_cats_p2 = models.PositiveIntegerField()
+    board_data = models.BinaryField(max_length=BOARD_DATA_SIZE)
+    promotions = models.JSONField(default=list)
+    winner = models.CharField(max_length=1)
+
+    @property
+    def board_planes(self) -> tuple[int, int, int, int]:
+        return decode_planes(bytes(self.board_data))
@@ -0,0 +1,17 @@
+from django.db import models
+from django.conf import settings
+
+class MatchResult(models.Model):
+    '''
+    A game played in memory between two strategies (see the play_matches command)
+    '''
+    created_at = models.DateTimeField(auto_now_add=True)
+    player1 = models.CharField(max_length=settings.NAMES_MAX_SIZE)
+    player2 = models.CharField(max_length=settings.NAMES_MAX_SIZE)
+    winner = models.CharField(
+        choices=(('n', 'nobody'), ('1', 'player 1'), ('2', 'player 2')),
+        max_length=1,
+        default='n',
+    )
+    n_plies = models.PositiveIntegerField()
+    moves = models.JSONField(null=True)
@@ -0,0 +1,18 @@
+from django.db import models
+from . import Game
+
+class Move(models.Model):
+    '''
+    The ply-th move of a game: a placement, or the units the player chose to promote
+    '''
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'ply'], name='unique_move_ply'),
+        ]
+
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='moves')
+    ply = models.PositiveIntegerField()
+    x = models.PositiveSmallIntegerField(null=True)
+    y = models.PositiveSmallIntegerField(null=True)
+    is_cat = models.BooleanField(null=True)
+    promotion = models.JSONField(null=True)
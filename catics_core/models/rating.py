@@ -0,0 +1,29 @@
+from django.db import models
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+
+class Rating(models.Model):
+    '''
+    The Elo rating of a user or an agent version, updated when one of its games ends
+    (see ratings), the recompute_ratings command rebuilds all of them from the games
+    '''
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player_type', 'player_id'], name='unique_rating_player'),
+        ]
+        indexes = [
+            # the leaderboard of users or agents
+            models.Index(fields=['player_type', '-rating'], name='rating_leaderboard'),
+        ]
+
+    player_type = models.ForeignKey(
+        ContentType,
+        limit_choices_to={ 'model__in': ['user', 'agentversion'] },
+        on_delete=models.CASCADE,
+    )
+    player_id = models.PositiveBigIntegerField()
+    player_object = GenericForeignKey('player_type', 'player_id')
+    rating = models.FloatField(default=settings.RATING_INITIAL)
+    n_games = models.PositiveIntegerField(default=0)
+    n_wins = models.PositiveIntegerField(default=0)
@@ -0,0 +1,61 @@
+import threading
+from collections import Counter
+from time import monotonic
+
+class GameNotifier:
+    '''
+    wakes up the requests waiting for a game of this process when it changes,
+    changes made by other processes are only seen by polling the database
+
+    every waiting request holds a thread, reserve() keeps some of them for the other requests
+    '''
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        # latest ply of the games somebody is waiting for
+        self.plies = {}
+        self.waiting = Counter()
+        self.n_reserved = 0
+
+    def reserve(self, max_waiters: int) -> bool:
+        '''
+        False when max_waiters requests already wait, release() must follow a True
+        '''
+        with self.condition:
+            if self.n_reserved >= max_waiters:
+                return False
+            self.n_reserved += 1
+            return True
+
+    def release(self):
+        with self.condition:
+            self.n_reserved -= 1
+
+    def notify(self, game_id: int, ply: int):
+        with self.condition:
+            if game_id not in self.waiting:
+                return
+            self.plies[game_id] = max(ply, self.plies.get(game_id, -1))
+            self.condition.notify_all()
+
+    def wait(self, game_id: int, ply: int, timeout: float) -> bool:
+        '''
+        returns True when the game reached a ply greater than this one before the timeout
+        '''
+        deadline = monotonic() + timeout
+        with self.condition:
+            self.waiting[game_id] += 1
+            try:
+                while self.plies.get(game_id, -1) <= ply:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        return False
+                    self.condition.wait(remaining)
+                return True
+            finally:
+                self.waiting[game_id] -= 1
+                if self.waiting[game_id] == 0:
+                    del self.waiting[game_id]
+                    self.plies.pop(game_id, None)
+
+notifier = GameNotifier()
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from .models import Rating
+
+# (content type id, id) of player 1 and player 2 of a game
+Players = tuple[tuple[int, int], tuple[int, int]]
+
+def is_rated(players: Players) -> bool:
+    '''
+    the games in memory have no players, nobody gains anything against themselves
+    '''
+    return None not in players[0] + players[1] and players[0] != players[1]
+
+def expected_score(rating: float, opponent: float) -> float:
+    return 1 / (1 + 10 ** ((opponent - rating) / 400))
+
+def apply_result(rating1: Rating, rating2: Rating, winner: str):
+    '''
+    the Elo update of both players of a game won by winner ('1' or '2')
+    '''
+    delta = settings.RATING_K * ((winner == '1') - expected_score(rating1.rating, rating2.rating))
+    rating1.rating += delta
+    rating2.rating -= delta
+    rating1.n_games += 1
+    rating2.n_games += 1
+    (rating1 if winner == '1' else rating2).n_wins += 1
+
+def record_results(results: list[tuple[Players, str]]):
+    '''
+    updates the ratings with the games which just ended, in their order,
+    the ratings are locked until the end of the transaction which saves the games
+    '''
+    results = [(players, winner) for (players, winner) in results if is_rated(players)]
+    if len(results) == 0:
+        return
+    keys = sorted({ key for (players, _) in results for key in players })
+    query = Q()
+    for (player_type_id, player_id) in keys:
+        query |= Q(player_type_id=player_type_id, player_id=player_id)
+    with transaction.atomic():
+        Rating.objects.bulk_create(
+            [Rating(player_type_id=t, player_id=i) for (t, i) in keys],
+            ignore_conflicts=True,
+        )
+        # always locked in the same order
+        ratings = {
+            (r.player_type_id, r.player_id): r
+            for r in Rating.objects.select_for_update().filter(query).order_by('player_type_id', 'player_id')
+        }
+        for ((player1, player2), winner) in results:
+            apply_result(ratings[player1], ratings[player2], winner)
+        Rating.objects.bulk_update(ratings.values(), ['rating', 'n_games', 'n_wins'])
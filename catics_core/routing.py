@@ -0,0 +1,6 @@
+from django.urls import path
+from . import consumers
+
+websocket_urlpatterns = [
+    path('game/<int:game_id>/ws/', consumers.GameConsumer.as_asgi(), name='core-game-ws'),
+]
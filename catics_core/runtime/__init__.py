@@ -0,0 +1 @@
+from .runtime import WasmRuntime, get_runtime
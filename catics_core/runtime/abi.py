@@ -0,0 +1,55 @@
+'''
+What an agent module has to export:
+-   memory
+-   input() -> i32: address of a buffer of INPUT_SIZE bytes, filled before every choose()
+-   choose() -> i32: the index of a promotion when there are some, square * 2 + is_cat otherwise
+    (square = x * 6 + y)
+
+Input buffer:
+-   0..35: the squares (x * 6 + y), 0 empty, 1 p1k, 2 p1c, 3 p2k, 4 p2c
+-   36..39: n_kittens_p1, n_cats_p1, n_kittens_p2, n_cats_p2
+-   40: 1 if player 1 has to play, 0 otherwise
+-   41: number of promotions
+-   42..: 3 bytes per promotion, the squares of its units (255 when there are less than 3)
+'''
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+
+MAX_PROMOTIONS = 96
+INPUT_SIZE = 42 + 3 * MAX_PROMOTIONS
+NO_UNIT = 255
+
+def encode_state(state: GameState) -> bytes:
+    data = bytearray(INPUT_SIZE)
+    for x in range(6):
+        for y in range(6):
+            position = state.board.get(x, y)
+            if position is not None:
+                data[x * 6 + y] = 1 + (not position.is_player1) * 2 + position.is_cat
+    data[36] = state.counts.n_kittens_p1
+    data[37] = state.counts.n_cats_p1
+    data[38] = state.counts.n_kittens_p2
+    data[39] = state.counts.n_cats_p2
+    data[40] = state.is_p1_turn
+    promotions = state.promotions[:MAX_PROMOTIONS]
+    data[41] = len(promotions)
+    for (i, p) in enumerate(promotions):
+        for j in range(3):
+            data[42 + i * 3 + j] = p.units[j][0] * 6 + p.units[j][1] if j < len(p.units) else NO_UNIT
+    return bytes(data)
+
+def decode_move(state: GameState, value: int) -> Placement | Promotion | None:
+    '''
+    None when the value is not a legal move
+    '''
+    if len(state.promotions) > 0:
+        if 0 <= value < min(len(state.promotions), MAX_PROMOTIONS):
+            return state.promotions[value]
+        return None
+    if not 0 <= value < 72:
+        return None
+    move = Placement(*divmod(value // 2, 6), value % 2 == 1)
+    if state.board.get(move.x, move.y) is not None \
+            or not state.counts.is_sup(state.is_p1_turn, move.is_cat, 0):
+        return None
+    return move
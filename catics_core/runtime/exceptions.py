@@ -0,0 +1,14 @@
+from rest_framework.exceptions import APIException
+
+class AgentFailedException(APIException):
+    status_code = 500
+    default_code = 'agent_failed'
+
+    def __init__(self, reason: str):
+        self.default_detail = 'L\'agent n\'a pas pu jouer : {}'.format(reason)
+        super().__init__()
+
+class AgentInvalidMoveException(APIException):
+    status_code = 500
+    default_code = 'agent_invalid_move'
+    default_detail = 'L\'agent a choisi un coup invalide'
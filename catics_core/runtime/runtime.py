@@ -0,0 +1,139 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+import wasmtime
+from django.conf import settings
+from ..models import AgentVersion
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+from .abi import INPUT_SIZE, encode_state, decode_move
+from .exceptions import AgentFailedException, AgentInvalidMoveException
+
+# the engine epoch is incremented every EPOCH_TICK seconds to enforce the time limit
+EPOCH_TICK = 0.01
+
+class WasmAgent:
+    '''
+    A warm instance of an agent module, with its own store
+    '''
+
+    def __init__(self, runtime, module: wasmtime.Module):
+        self.store = wasmtime.Store(runtime.engine)
+        self.store.set_limits(memory_size=runtime.memory_size)
+        self.store.set_fuel(runtime.fuel)
+        self.store.set_epoch_deadline(runtime.epoch_deadline)
+        instance = wasmtime.Instance(self.store, module, [])
+        exports = instance.exports(self.store)
+        try:
+            self.memory = exports['memory']
+            self.choose_func = exports['choose']
+            self.input = exports['input'](self.store)
+        except KeyError as e:
+            raise AgentFailedException('export {} manquant'.format(e))
+        if not 0 <= self.input <= self.memory.data_len(self.store) - INPUT_SIZE:
+            raise AgentFailedException('buffer d\'entrée invalide')
+
+    def choose(self, runtime, state: GameState) -> int:
+        self.store.set_fuel(runtime.fuel)
+        self.store.set_epoch_deadline(runtime.epoch_deadline)
+        self.memory.write(self.store, encode_state(state), self.input)
+        return self.choose_func(self.store)
+
+class WasmRuntime:
+    '''
+    Runs the agents modules: each AgentVersion is compiled once, and a few instances of it are
+    kept warm, every call is limited in fuel, time and memory
+    '''
+
+    def __init__(
+        self,
+        fuel: int = settings.WASM_FUEL,
+        time_limit: float = settings.WASM_TIME_LIMIT.total_seconds(),
+        memory_size: int = settings.WASM_MEMORY_MAX,
+        pool_size: int = settings.WASM_POOL_SIZE,
+        cache_size: int = settings.WASM_CACHE_SIZE,
+    ):
+        config = wasmtime.Config()
+        config.consume_fuel = True
+        config.epoch_interruption = True
+        self.engine = wasmtime.Engine(config)
+        self.fuel = fuel
+        self.epoch_deadline = max(1, round(time_limit / EPOCH_TICK))
+        self.memory_size = memory_size
+        self.pool_size = pool_size
+        self.cache_size = cache_size
+        # (version id, updated_at) -> compiled module, least recently used first
+        self.modules: OrderedDict[tuple, wasmtime.Module] = OrderedDict()
+        # (version id, updated_at) -> idle instances
+        self.pools: dict[tuple, list[WasmAgent]] = {}
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.ticker = threading.Thread(target=self.tick, daemon=True)
+        self.ticker.start()
+
+    def tick(self):
+        while not self.closed.wait(EPOCH_TICK):
+            self.engine.increment_epoch()
+
+    def close(self):
+        self.closed.set()
+        self.ticker.join()
+
+    def module(self, version: AgentVersion) -> wasmtime.Module:
+        key = (version.id, version.updated_at)
+        with self.lock:
+            if key in self.modules:
+                self.modules.move_to_end(key)
+                return self.modules[key]
+        try:
+            module = wasmtime.Module(self.engine, bytes(version.wasm))
+        except wasmtime.WasmtimeError as e:
+            raise AgentFailedException(str(e))
+        with self.lock:
+            self.modules[key] = module
+            while len(self.modules) > self.cache_size:
+                (evicted, _) = self.modules.popitem(last=False)
+                self.pools.pop(evicted, None)
+        return module
+
+    @contextmanager
+    def agent(self, version: AgentVersion):
+        key = (version.id, version.updated_at)
+        with self.lock:
+            pool = self.pools.get(key)
+            agent = pool.pop() if pool else None
+        if agent is None:
+            try:
+                agent = WasmAgent(self, self.module(version))
+            except (wasmtime.WasmtimeError, wasmtime.Trap) as e:
+                raise AgentFailedException(str(e))
+        # an instance which failed is not reused, its memory may be in any state
+        yield agent
+        with self.lock:
+            # the pool goes with the module, an instance of an evicted one is dropped
+            if key not in self.modules:
+                return
+            pool = self.pools.setdefault(key, [])
+            if len(pool) < self.pool_size:
+                pool.append(agent)
+
+    def choose(self, version: AgentVersion, state: GameState) -> Placement | Promotion:
+        with self.agent(version) as agent:
+            try:
+                value = agent.choose(self, state)
+            except (wasmtime.WasmtimeError, wasmtime.Trap) as e:
+                raise AgentFailedException(str(e))
+        move = decode_move(state, value)
+        if move is None:
+            raise AgentInvalidMoveException()
+        return move
+
+_runtime = None
+_runtime_lock = threading.Lock()
+
+def get_runtime() -> WasmRuntime:
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = WasmRuntime()
+        return _runtime
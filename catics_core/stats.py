@@ -0,0 +1,71 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+from django.conf import settings
+
+@dataclass
+class RequestSample:
+    endpoint: str
+    n_queries: int
+    db_time: float
+    python_time: float
+    # spent waiting for something else (the long polling of GameWaitView), not in python
+    wait_time: float = 0
+
+# the sample of the request handled by this thread, set by QueryStatsMiddleware
+current = threading.local()
+
+@contextmanager
+def waiting():
+    '''
+    the time spent in this block is counted as the wait time of the current request
+    '''
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        sample = getattr(current, 'sample', None)
+        if sample is not None:
+            sample.wait_time += perf_counter() - start
+
+def percentile(values: list[float], p: float) -> float:
+    '''
+    nearest rank percentile, values must be sorted
+    '''
+    if len(values) == 0:
+        return 0
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+class RequestStats:
+    '''
+    the last REQUEST_STATS_SIZE requests of this process, filled by QueryStatsMiddleware
+    '''
+
+    def __init__(self, size: int):
+        self.samples = deque(maxlen=size)
+
+    def add(self, sample: RequestSample):
+        self.samples.append(sample)
+
+    def clear(self):
+        self.samples.clear()
+
+    def percentiles(self, percents: tuple[float, ...] = (50, 90, 99, 100)) -> dict[str, dict]:
+        '''
+        { endpoint: { 'count', 'n_queries', 'db_time', 'python_time', 'wait_time' } },
+        each measure is the list of its percentiles
+        '''
+        by_endpoint = {}
+        for sample in list(self.samples):
+            by_endpoint.setdefault(sample.endpoint, []).append(sample)
+        result = {}
+        for (endpoint, samples) in sorted(by_endpoint.items()):
+            result[endpoint] = { 'count': len(samples) }
+            for measure in ('n_queries', 'db_time', 'python_time', 'wait_time'):
+                values = sorted(getattr(s, measure) for s in samples)
+                result[endpoint][measure] = [percentile(values, p) for p in percents]
+        return result
+
+request_stats = RequestStats(settings.REQUEST_STATS_SIZE)
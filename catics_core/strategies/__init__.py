@@ -0,0 +1,13 @@
+from .strategy import Strategy
+from .random_strategy import RandomStrategy
+from .alpha_beta import AlphaBetaStrategy
+from .mcts import MonteCarloStrategy
+from .wasm_strategy import WasmStrategy
+from .match import play_match
+
+# strategies the commands can refer to by name
+STRATEGIES = {
+    'random': RandomStrategy,
+    'alphabeta': AlphaBetaStrategy,
+    'mcts': MonteCarloStrategy,
+}
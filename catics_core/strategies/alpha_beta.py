@@ -0,0 +1,163 @@
+from time import perf_counter
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+from ..game_state.windows import WINDOW_MASKS
+from .strategy import Strategy
+
+WIN = 1_000_000
+# transposition table flags
+EXACT = 0
+LOWER = 1
+UPPER = 2
+CENTER = sum(1 << (x * 6 + y) for x in range(1, 5) for y in range(1, 5))
+# the placements tried first: cats, then the center
+PLACEMENT_ORDER = {
+    Placement(x, y, is_cat): -(is_cat * 100 + (6 - abs(2 * x - 5) - abs(2 * y - 5)))
+    for x in range(6)
+    for y in range(6)
+    for is_cat in (False, True)
+}
+
+class SearchTimeout(Exception):
+    pass
+
+def evaluate(state: GameState) -> int:
+    '''
+    score of the player to move: the cats, the units next to the center,
+    and the windows with two units of a player and nothing of the other one
+    '''
+    if state.winner != 'n':
+        return WIN if (state.winner == '1') == state.is_p1_turn else -WIN
+    (p2k, p2c, p1k, p1c) = state.board.units
+    p1 = p1k | p1c
+    p2 = p2k | p2c
+    score = 100 * (state.counts.n_cats_p1 + p1c.bit_count() - state.counts.n_cats_p2 - p2c.bit_count())
+    score += 3 * ((p1 & CENTER).bit_count() - (p2 & CENTER).bit_count())
+    for mask in WINDOW_MASKS:
+        if p1 & mask:
+            if not p2 & mask and (p1 & mask).bit_count() == 2:
+                score += 20 + 10 * ((p1c & mask).bit_count())
+        elif p2 & mask and (p2 & mask).bit_count() == 2:
+            score -= 20 + 10 * ((p2c & mask).bit_count())
+    return score if state.is_p1_turn else -score
+
+class AlphaBetaStrategy(Strategy):
+    '''
+    Negamax with alpha-beta pruning and iterative deepening until time_limit seconds are spent,
+    its state must use a BitBoard
+    '''
+
+    def __init__(self, seed: int = 0, time_limit: float = 0.2, max_depth: int = 32, table_size: int = 1 << 18):
+        super().__init__(seed)
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.table_size = table_size
+        # hash -> (depth, score, flag, best move)
+        self.table = {}
+        self.n_nodes = 0
+        self.depth = 0
+
+    def choose(self, state: GameState) -> Placement | Promotion:
+        moves = list(state.legal_moves())
+        if len(moves) == 1:
+            return moves[0]
+        self.deadline = perf_counter() + self.time_limit
+        self.n_nodes = 0
+        best = moves[0]
+        for depth in range(1, self.max_depth + 1):
+            try:
+                (_, move) = self.root(state, depth)
+            except SearchTimeout:
+                # this depth is not complete, child already unmade its moves
+                break
+            best = move
+            self.depth = depth
+        return best
+
+    def root(self, state: GameState, depth: int) -> tuple[int, Placement | Promotion]:
+        alpha = -WIN - self.max_depth - 1
+        best = None
+        for move in self.ordered_moves(state):
+            score = self.child(state, move, depth, alpha, WIN + self.max_depth + 1)
+            if best is None or score > alpha:
+                (alpha, best) = (score, move)
+        self.store(state, depth, alpha, EXACT, best)
+        return (alpha, best)
+
+    def child(self, state: GameState, move: Placement | Promotion, depth: int, alpha: int, beta: int) -> int:
+        '''
+        score of the move for the player who plays it
+        '''
+        is_p1_turn = state.is_p1_turn
+        state.make_move(move)
+        try:
+            # after a placement which needs a promotion, the same player moves again
+            if state.is_p1_turn == is_p1_turn:
+                return self.negamax(state, depth - 1, alpha, beta)
+            return -self.negamax(state, depth - 1, -beta, -alpha)
+        finally:
+            state.unmake_move()
+
+    def negamax(self, state: GameState, depth: int, alpha: int, beta: int) -> int:
+        self.n_nodes += 1
+        if self.n_nodes & 1023 == 0 and perf_counter() > self.deadline:
+            raise SearchTimeout()
+        if state.winner != 'n':
+            # the sooner the better
+            score = evaluate(state)
+            return score + depth if score > 0 else score - depth
+        if depth <= 0:
+            return evaluate(state)
+
+        original_alpha = alpha
+        entry = self.table.get(state.hash)
+        if entry is not None and entry[0] >= depth:
+            (_, score, flag, _) = entry
+            if flag == EXACT:
+                return score
+            if flag == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        best_score = -WIN - self.max_depth - 1
+        best = None
+        for move in self.ordered_moves(state):
+            score = self.child(state, move, depth, alpha, beta)
+            if score > best_score:
+                (best_score, best) = (score, move)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.store(state, depth, best_score, flag, best)
+        return best_score
+
+    def store(self, state: GameState, depth: int, score: int, flag: int, move: Placement | Promotion):
+        if len(self.table) >= self.table_size:
+            # bounded: forget everything, the next searches fill it again
+            self.table.clear()
+        self.table[state.hash] = (depth, score, flag, move)
+
+    def ordered_moves(self, state: GameState) -> list[Placement | Promotion]:
+        '''
+        the best move of the transposition table first, then the cats and the center
+        '''
+        moves = list(state.legal_moves())
+        if len(moves) > 0 and isinstance(moves[0], Placement):
+            moves.sort(key=PLACEMENT_ORDER.__getitem__)
+        entry = self.table.get(state.hash)
+        if entry is not None:
+            for (i, move) in enumerate(moves):
+                if move == entry[3]:
+                    moves.insert(0, moves.pop(i))
+                    break
+        return moves
@@ -0,0 +1,34 @@
+from ..models import Game
+from ..game_state import GameState, BitBoard, Placement
+from .strategy import Strategy
+
+def move_value(move) -> dict:
+    '''
+    the move as the play / promote endpoints receive it
+    '''
+    if isinstance(move, Placement):
+        return { 'x': move.x, 'y': move.y, 'is_cat': move.is_cat }
+    return { 'units': [list(u) for u in move.units] }
+
+def play_match(
+    player1: Strategy,
+    player2: Strategy,
+    max_plies: int = 500,
+    with_moves: bool = False,
+) -> tuple[str, int, list[dict] | None]:
+    '''
+    plays a whole game in memory, returns the winner ('n' after max_plies), the number of plies
+    and the moves if asked
+    '''
+    state = GameState(Game(), BitBoard)
+    moves = [] if with_moves else None
+    n_plies = 0
+    while state.winner == 'n' and n_plies < max_plies:
+        move = (player1 if state.is_p1_turn else player2).choose(state)
+        state.make_move(move)
+        # the strategies never go back, no need to keep the undo stack
+        state.history.clear()
+        n_plies += 1
+        if with_moves:
+            moves.append(move_value(move))
+    return (state.winner, n_plies, moves)
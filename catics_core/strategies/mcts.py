@@ -0,0 +1,147 @@
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+import django
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+from .strategy import Strategy
+
+class Node:
+    def __init__(self, parent: 'Node | None', move: Placement | Promotion | None, is_player1: bool, moves: list):
+        self.parent = parent
+        self.move = move
+        # the player who played move
+        self.is_player1 = is_player1
+        self.untried = moves
+        self.children = []
+        self.n_visits = 0
+        self.n_wins = 0.0
+
+    def select(self, exploration: float) -> 'Node':
+        log_visits = math.log(self.n_visits)
+        return max(
+            self.children,
+            key=lambda c: c.n_wins / c.n_visits + exploration * math.sqrt(log_visits / c.n_visits),
+        )
+
+def search(
+    state: GameState,
+    n_simulations: int,
+    seed: int,
+    exploration: float = 1.4,
+    max_rollout_plies: int = 200,
+) -> tuple[dict, int]:
+    '''
+    one UCT tree from this state, returns the visits and wins of each root move, and the number of
+    plies played (tree and rollouts)
+    '''
+    rng = random.Random(seed)
+    root = Node(None, None, not state.is_p1_turn, list(state.legal_moves()))
+    n_plies = 0
+    for _ in range(n_simulations):
+        node = root
+        depth = 0
+
+        # selection
+        while len(node.untried) == 0 and len(node.children) > 0:
+            node = node.select(exploration)
+            state.make_move(node.move)
+            depth += 1
+
+        # expansion
+        if len(node.untried) > 0:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            is_player1 = state.is_p1_turn
+            state.make_move(move)
+            depth += 1
+            child = Node(node, move, is_player1, list(state.legal_moves()))
+            node.children.append(child)
+            node = child
+
+        # rollout
+        n_rollout_plies = 0
+        while state.winner == 'n' and n_rollout_plies < max_rollout_plies:
+            state.make_move(rng.choice(list(state.legal_moves())))
+            n_rollout_plies += 1
+        winner = state.winner
+        for _ in range(depth + n_rollout_plies):
+            state.unmake_move()
+        n_plies += depth + n_rollout_plies
+
+        # backpropagation
+        while node is not None:
+            node.n_visits += 1
+            if winner == 'n':
+                node.n_wins += 0.5
+            elif (winner == '1') == node.is_player1:
+                node.n_wins += 1
+            node = node.parent
+
+    return ({ c.move: (c.n_visits, c.n_wins) for c in root.children }, n_plies)
+
+class MonteCarloStrategy(Strategy):
+    '''
+    Monte Carlo tree search, the simulations of each move are split between independent trees
+    (root parallelism) in a process pool, the most visited move of all trees is played
+    '''
+
+    def __init__(self, seed: int = 0, n_simulations: int = 1000, workers: int = 1):
+        super().__init__(seed)
+        self.n_simulations = n_simulations
+        self.workers = workers
+        self.executor = None
+        self.n_moves = 0
+        # of the last search, and of all the searches
+        self.nodes_per_second = 0.0
+        self.n_nodes = 0
+        self.search_time = 0.0
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def choose(self, state: GameState) -> Placement | Promotion:
+        moves = list(state.legal_moves())
+        if len(moves) == 1:
+            return moves[0]
+        # the random rollouts cannot tell a win from a good move
+        for move in moves:
+            state.make_move(move)
+            winner = state.winner
+            state.unmake_move()
+            if winner != 'n' and (winner == '1') == state.is_p1_turn:
+                return move
+        self.n_moves += 1
+        # every tree gets its own seed
+        seeds = [(self.seed * 1_000_003 + self.n_moves) * self.workers + i for i in range(self.workers)]
+        simulations = [
+            self.n_simulations // self.workers + (i < self.n_simulations % self.workers)
+            for i in range(self.workers)
+        ]
+
+        start = perf_counter()
+        if self.workers > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers, initializer=django.setup)
+            # the workers receive a copy of the state without its undo stack
+            history = state.history
+            state.history = []
+            try:
+                results = list(self.executor.map(search, [state] * self.workers, simulations, seeds))
+            finally:
+                state.history = history
+        else:
+            results = [search(state, simulations[0], seeds[0])]
+        duration = perf_counter() - start
+        n_nodes = sum(n for (_, n) in results)
+        self.nodes_per_second = n_nodes / duration if duration > 0 else 0
+        self.n_nodes += n_nodes
+        self.search_time += duration
+
+        visits = {}
+        for (children, _) in results:
+            for (move, (n_visits, _)) in children.items():
+                visits[move] = visits.get(move, 0) + n_visits
+        return max(moves, key=lambda m: visits.get(m, 0))
@@ -0,0 +1,12 @@
+import random
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+from .strategy import Strategy
+
+class RandomStrategy(Strategy):
+    def __init__(self, seed: int = 0):
+        super().__init__(seed)
+        self.random = random.Random(seed)
+
+    def choose(self, state: GameState) -> Placement | Promotion:
+        return self.random.choice(list(state.legal_moves()))
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+
+class Strategy(ABC):
+    '''
+    Chooses the moves of one player, the state must be left as it was received
+    '''
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+
+    @abstractmethod
+    def choose(self, state: GameState) -> Placement | Promotion:
+        pass
+
+    def close(self):
+        '''
+        releases what the strategy started (processes...), it is not used anymore
+        '''
+        pass
@@ -0,0 +1,17 @@
+from ..models import AgentVersion
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
+from ..runtime import get_runtime
+from .strategy import Strategy
+
+class WasmStrategy(Strategy):
+    '''
+    The moves of an uploaded agent
+    '''
+
+    def __init__(self, version: AgentVersion, seed: int = 0):
+        super().__init__(seed)
+        self.version = version
+
+    def choose(self, state: GameState) -> Placement | Promotion:
+        return get_runtime().choose(self.version, state)
@@ -0,0 +1,23 @@
+;; plays a kitten (a cat when there are no kittens left) on the first empty square,
+;; and the first promotion when there are some
+(module
+  (memory (export "memory") 1)
+  (func (export "input") (result i32)
+    (i32.const 1024))
+  (func (export "choose") (result i32)
+    (local $square i32)
+    (local $kittens i32)
+    (if (i32.load8_u (i32.const 1065))
+      (then (return (i32.const 0))))
+    (block $found
+      (loop $next
+        (br_if $found (i32.eqz (i32.load8_u (i32.add (i32.const 1024) (local.get $square)))))
+        (local.set $square (i32.add (local.get $square) (i32.const 1)))
+        (br $next)))
+    (local.set $kittens
+      (if (result i32) (i32.load8_u (i32.const 1064))
+        (then (i32.load8_u (i32.const 1060)))
+        (else (i32.load8_u (i32.const 1062)))))
+    (i32.add
+      (i32.mul (local.get $square) (i32.const 2))
+      (i32.eqz (local.get $kittens)))))
@@ -0,0 +1,8 @@
+(module
+  (memory (export "memory") 1)
+  (func (export "input") (result i32)
+    (i32.const 0))
+  (func (export "choose") (result i32)
+    (loop $forever
+      (br $forever))
+    (i32.const 0)))
@@ -0,0 +1,9 @@
+;; tries to grow its memory to 128 MiB
+(module
+  (memory (export "memory") 1)
+  (func (export "input") (result i32)
+    (i32.const 0))
+  (func (export "choose") (result i32)
+    (if (i32.eq (memory.grow (i32.const 2048)) (i32.const -1))
+      (then unreachable))
+    (i32.const 0)))
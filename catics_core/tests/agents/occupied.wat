@@ -0,0 +1,7 @@
+;; always plays a kitten on (0, 0)
+(module
+  (memory (export "memory") 1)
+  (func (export "input") (result i32)
+    (i32.const 0))
+  (func (export "choose") (result i32)
+    (i32.const 0)))
@@ -2,7 +2,8 @@ from django.contrib.auth import get_user_model
 from django.urls import reverse
 from django.utils import timezone
 from catics_auth.models import Validation
-from ..game_state import GameState
+from ..game_state import GameState, Placement
+from ..game_state.promotions import Promotion
 from ..models import Game
 
 User = get_user_model()
@@ -14,6 +15,7 @@ def two_players_setup(case):
         username='player1',
         email='player1@catics.fr',
         password=PASSWORD,
+        is_validated=True,
     )
     Validation.objects.create(
         user=case.player1,
@@ -32,6 +34,7 @@ def two_players_setup(case):
         username='player2',
         email='player2@catics.fr',
         password=PASSWORD,
+        is_validated=True,
     )
     Validation.objects.create(
         user=case.player2,
@@ -102,3 +105,25 @@ def all_units(game: Game, are_cats: bool, skip_last_move: bool = False, with_lin
     if not skip_last_move:
         state.play(0, 5, are_cats)
     state.save()
+
+def random_move(state: GameState, rng) -> Placement | Promotion:
+    '''
+    a random placement, or a random promotion if one is pending
+    (promotions are sorted first so the choice does not depend on the board implementation)
+    '''
+    if len(state.promotions) > 0:
+        return rng.choice(sorted(state.promotions, key=lambda p: p.units))
+    free = [(x, y) for x in range(6) for y in range(6) if state.board.get(x, y) is None]
+    (x, y) = rng.choice(free)
+    is_cat = state.counts.is_sup(state.is_p1_turn, True, 0)
+    if is_cat and state.counts.is_sup(state.is_p1_turn, False, 0):
+        is_cat = rng.random() < 0.5
+    return Placement(x, y, is_cat)
+
+def play_random_move(state: GameState, rng):
+    move = random_move(state, rng)
+    if isinstance(move, Promotion):
+        state.promote(state.promotions.index(move))
+        state.is_p1_turn = not state.is_p1_turn
+        return
+    state.play(move.x, move.y, move.is_cat)
@@ -0,0 +1,33 @@
+from django.test import TestCase
+from ..models import Game
+from ..game_state import GameState, BitBoard, Placement
+from ..strategies import AlphaBetaStrategy, RandomStrategy, STRATEGIES, play_match
+
+class AlphaBetaTestCase(TestCase):
+    def test_immediate_win(self):
+        game = Game(n_kittens_p1=4, n_cats_p1=2, n_kittens_p2=7)
+        game.board = { 0: { 0: [True, True] }, 1: { 0: [True, True] }, 5: { 5: [False, False] } }
+        state = GameState(game, BitBoard)
+        strategy = AlphaBetaStrategy(time_limit=0.5)
+        hash = state.hash
+        move = strategy.choose(state)
+        self.assertEqual(move, Placement(2, 0, True))
+        # the state is left as it was
+        self.assertEqual(state.hash, hash)
+        self.assertEqual(state.history, [])
+
+    def test_against_random(self):
+        # bounded by depth, not by time, so the games do not depend on the speed of the machine
+        (winner, _, _) = play_match(AlphaBetaStrategy(0, time_limit=60, max_depth=2), RandomStrategy(0), max_plies=200)
+        self.assertEqual(winner, '1')
+        (winner, _, _) = play_match(RandomStrategy(1), AlphaBetaStrategy(1, time_limit=60, max_depth=2), max_plies=200)
+        self.assertEqual(winner, '2')
+
+    def test_bounded_table(self):
+        strategy = AlphaBetaStrategy(time_limit=0.1, table_size=100)
+        strategy.choose(GameState(Game(), BitBoard))
+        self.assertLessEqual(len(strategy.table), 100)
+        self.assertGreater(strategy.depth, 0)
+
+    def test_registry(self):
+        self.assertIs(STRATEGIES['alphabeta'], AlphaBetaStrategy)
@@ -0,0 +1,42 @@
+import numpy as np
+from django.test import SimpleTestCase
+from ..game_state.batch import BatchSimulator, CANDIDATE_MASKS, N_WINDOWS
+from ..management.commands.simulate import mismatch, replay
+
+class BatchTestCase(SimpleTestCase):
+    def test_same_as_game_state(self):
+        for seed in range(3):
+            simulator = BatchSimulator(200, seed, record=True)
+            simulator.run()
+            self.assertFalse((simulator.winner == 0).any())
+            for game in range(200):
+                self.assertFalse(mismatch(simulator, game), 'seed {} game {}'.format(seed, game))
+
+    def test_steps(self):
+        # every step is checked, not only the end of the games
+        simulator = BatchSimulator(50, 7, record=True)
+        while simulator.step() > 0:
+            for game in range(50):
+                self.assertFalse(mismatch(simulator, game))
+
+    def test_seed(self):
+        first = BatchSimulator(100, 1)
+        first.run()
+        second = BatchSimulator(100, 1)
+        second.run()
+        self.assertTrue((first.units == second.units).all())
+        self.assertTrue((first.ply == second.ply).all())
+
+    def test_max_plies(self):
+        simulator = BatchSimulator(100, 0, max_plies=10, record=True)
+        simulator.run()
+        self.assertTrue((simulator.ply <= 11).all())
+        self.assertTrue(((simulator.ply >= 10) | (simulator.winner != 0)).all())
+        state = replay(simulator, 0)
+        self.assertEqual(state.ply, simulator.ply[0])
+
+    def test_candidates(self):
+        # a window of 3 squares, then single squares
+        counts = np.bitwise_count(CANDIDATE_MASKS)
+        self.assertTrue((counts[:N_WINDOWS] == 3).all())
+        self.assertTrue((counts[N_WINDOWS:] == 1).all())
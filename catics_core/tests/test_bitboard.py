@@ -0,0 +1,41 @@
+import random
+from django.test import SimpleTestCase
+from ..models import Game
+from ..game_state import GameState, Board, BitBoard, Position
+from .helpers import play_random_move
+
+class BitBoardTestCase(SimpleTestCase):
+    def assertSameState(self, state: GameState, bit_state: GameState):
+        self.assertEqual(bit_state.board.value(), state.board.value())
+        self.assertEqual(len(bit_state.board), len(state.board))
+        self.assertEqual(bit_state.board.players(), state.board.players())
+        self.assertEqual(vars(bit_state.counts), vars(state.counts))
+        self.assertEqual(bit_state.is_p1_turn, state.is_p1_turn)
+        self.assertEqual(bit_state.winner, state.winner)
+        self.assertEqual(
+            sorted(p.units for p in bit_state.promotions),
+            sorted(p.units for p in state.promotions),
+        )
+
+    def test_load(self):
+        value = { 0: { 0: [True, False], 5: [False, True] }, 3: { 2: [True, True] } }
+        board = BitBoard(value)
+        self.assertEqual(len(board), 3)
+        self.assertEqual(board.get(0, 0), Position(True, False))
+        self.assertEqual(board.get(0, 5), Position(False, True))
+        self.assertEqual(board.get(3, 2), Position(True, True))
+        self.assertIsNone(board.get(1, 1))
+        self.assertIsNone(board.get(6, 0))
+        self.assertEqual(board.value(), value)
+        self.assertEqual(repr(board), repr(Board(value)))
+
+    def test_random_games(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            state = GameState(Game())
+            bit_state = GameState(Game(), BitBoard)
+            while state.winner == 'n':
+                seed = rng.random()
+                play_random_move(state, random.Random(seed))
+                play_random_move(bit_state, random.Random(seed))
+                self.assertSameState(state, bit_state)
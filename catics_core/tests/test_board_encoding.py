@@ -0,0 +1,39 @@
+import random
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from ..models import Game
+from ..models.board_encoding import BOARD_DATA_SIZE, encode_planes, decode_planes, planes_from_value
+from ..game_state import GameState, Board, BitBoard
+from ..management.commands.bench_promotions import random_board
+from .helpers import PASSWORD
+
+User = get_user_model()
+
+class BoardEncodingTestCase(TestCase):
+    def test_round_trip(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            value = random_board(rng, rng.randint(0, 36))
+            planes = planes_from_value(value)
+            data = encode_planes(planes)
+            self.assertEqual(len(data), BOARD_DATA_SIZE)
+            self.assertEqual(decode_planes(data), planes)
+            self.assertEqual(BitBoard.from_planes(planes).value(), BitBoard(value).value())
+            self.assertEqual(Board.from_planes(planes).planes(), planes)
+
+    def test_legacy_json(self):
+        player = User.objects.create_user(username='player', email='player@catics.fr', password=PASSWORD)
+        value = { 0: { 0: [True, False] }, 4: { 3: [False, True] } }
+        game = Game.objects.create(player1_object=player, player2_object=player)
+        # a row written before board_data existed
+        Game.objects.filter(id=game.id).update(board_data=None, board_json=value)
+        game.refresh_from_db()
+        self.assertEqual(game.board, value)
+
+        state = GameState(game, BitBoard)
+        state.play(2, 2, False)
+        state.save()
+        game.refresh_from_db()
+        self.assertIsNone(game.board_json)
+        self.assertEqual(len(bytes(game.board_data)), BOARD_DATA_SIZE)
+        self.assertEqual(game.board, state.board.value())
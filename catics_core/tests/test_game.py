@@ -3,9 +3,10 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase
 from catics_auth.models import Validation
-from ..models import Agent, Game
+from ..models import Agent, AgentVersion, Game, Move
 from ..game_state import Board, Position
 from .helpers import all_units, PASSWORD
+from .test_runtime import load_agent
 
 User = get_user_model()
 
@@ -15,6 +16,7 @@ class GameTestCase(APITestCase):
             username='player1',
             email='player1@catics.fr',
             password=PASSWORD,
+            is_validated=True,
         )
         Validation.objects.create(
             user=self.player1,
@@ -32,6 +34,7 @@ class GameTestCase(APITestCase):
             username='player2',
             email='player2@catics.fr',
             password=PASSWORD,
+            is_validated=True,
         )
         Validation.objects.create(
             user=self.player2,
@@ -41,7 +44,7 @@ class GameTestCase(APITestCase):
         )
 
     def test_unvalidated(self):
-        Validation.objects.filter(user=self.player1).update(is_validated=False)
+        User.objects.filter(id=self.player1.id).update(is_validated=False)
         response = self.client.put(
             reverse('core-game'),
             { 'player2_user': self.player2.id },
@@ -71,6 +74,7 @@ class GameTestCase(APITestCase):
             username='spectator',
             email='spectator@catics.fr',
             password=PASSWORD,
+            is_validated=True,
         )
         Validation.objects.create(
             user=spectator,
@@ -129,6 +133,79 @@ class GameTestCase(APITestCase):
         self.assertIn('board', response.data)
         self.assertEqual(len(response.data['board']), 0)
 
+    def test_agents(self):
+        mine = Agent.objects.create(owner=self.player1, name='mine')
+        theirs = Agent.objects.create(owner=self.player2, name='theirs')
+        response = self.client.put(reverse('core-game'), { 'player2_agent': theirs.id })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['detail'].code, 'no_agent_version')
+
+        AgentVersion.objects.create(agent=mine, number=1, wasm=b'')
+        latest = AgentVersion.objects.create(agent=mine, number=2, wasm=b'')
+        AgentVersion.objects.create(agent=theirs, number=1, wasm=b'')
+        response = self.client.put(
+            reverse('core-game'),
+            { 'player1_agent': theirs.id, 'player2_user': self.player2.id },
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['detail'].code, 'not_your_agent')
+
+        response = self.client.put(
+            reverse('core-game'),
+            { 'player1_agent': mine.id, 'player2_agent': theirs.id },
+        )
+        self.assertEqual(response.status_code, 200)
+        game = Game.objects.get(id=response.data['id'])
+        self.assertEqual(game.player1_id, latest.id)
+        response = self.client.get(reverse('core-game'), { 'id': game.id })
+        self.assertEqual(response.data['player1_agent'], 'mine')
+        self.assertEqual(response.data['player1_agent_version'], 2)
+        self.assertEqual(response.data['player2_agent'], 'theirs')
+
+        # an agent version with the id of the user does not let them play
+        impostor = AgentVersion.objects.filter(id=self.player1.id).first() \
+            or AgentVersion.objects.create(id=self.player1.id, agent=theirs, wasm=b'')
+        game = Game.objects.create(player1_object=impostor, player2_object=self.player2)
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': game.id, 'x': 0, 'y': 0, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_agent_reply(self):
+        agent = Agent.objects.create(owner=self.player1, name='first_square')
+        AgentVersion.objects.create(agent=agent, wasm=load_agent('first_square'))
+        response = self.client.put(reverse('core-game'), { 'player2_agent': agent.id })
+        id = response.data['id']
+        response = self.client.post(reverse('core-play'), { 'game': id, 'x': 3, 'y': 3, 'is_cat': False })
+        self.assertEqual(response.status_code, 200)
+        # the agent played on the first empty square
+        self.assertEqual(response.data['ply'], 2)
+        self.assertTrue(response.data['is_p1_turn'])
+        self.assertEqual(response.data['board'][0][0], [False, False])
+        self.assertEqual(Move.objects.filter(game_id=id).count(), 2)
+
+        # the agent moves first
+        response = self.client.put(
+            reverse('core-game'),
+            { 'player1_agent': agent.id, 'player2_user': self.player2.id },
+        )
+        game = Game.objects.get(id=response.data['id'])
+        self.assertEqual(game.ply, 1)
+        self.assertFalse(game.is_p1_turn)
+
+    def test_agent_fails(self):
+        agent = Agent.objects.create(owner=self.player1, name='occupied')
+        AgentVersion.objects.create(agent=agent, wasm=load_agent('occupied'))
+        response = self.client.put(reverse('core-game'), { 'player2_agent': agent.id })
+        # the agent plays on (0, 0) which is taken
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': response.data['id'], 'x': 0, 'y': 0, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['winner'], '1')
+
     def test_get_basic(self):
         response = self.client.put(
             reverse('core-game'),
@@ -280,3 +357,33 @@ class GameTestCase(APITestCase):
         self.assertEqual(response.data['n_cats_p1'], 0)
         self.assertEqual(response.data['n_kittens_p2'], 0)
         self.assertEqual(response.data['n_cats_p2'], 7)
+
+    def test_etag(self):
+        response = self.client.put(
+            reverse('core-game'),
+            { 'player2_user': self.player2.id },
+        )
+        id = response.data['id']
+        response = self.client.get(reverse('core-game'), { 'id': id })
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers['ETag']
+
+        response = self.client.get(reverse('core-game'), { 'id': id }, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers['ETag'], etag)
+        response = self.client.get(reverse('core-game'), { 'id': id }, HTTP_IF_NONE_MATCH='"0-0", ' + etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(reverse('core-play'), { 'game': id, 'x': 0, 'y': 0, 'is_cat': False })
+        response = self.client.get(reverse('core-game'), { 'id': id }, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertEqual(len(response.data['board']), 1)
+
+        # any write is a new version
+        etag = response.headers['ETag']
+        game = Game.objects.get(id=id)
+        game.board = {}
+        game.save()
+        response = self.client.get(reverse('core-game'), { 'id': id }, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
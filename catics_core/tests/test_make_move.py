@@ -0,0 +1,48 @@
+import random
+from django.test import SimpleTestCase
+from ..models import Game
+from ..game_state import GameState, Board, BitBoard, Placement
+from ..game_state.exceptions import OccupiedException
+from .helpers import random_move
+
+def snapshot(state: GameState):
+    return (
+        state.ply,
+        state.board.value(),
+        state.board.players(),
+        list(state.board.lines.windows),
+        vars(state.counts).copy(),
+        state.is_p1_turn,
+        state.winner,
+        [p.units for p in state.promotions],
+    )
+
+class MakeMoveTestCase(SimpleTestCase):
+    def test_random_games(self):
+        rng = random.Random(0)
+        for board_class in (Board, BitBoard):
+            for _ in range(20):
+                state = GameState(Game(), board_class)
+                snapshots = []
+                while state.winner == 'n':
+                    snapshots.append(snapshot(state))
+                    state.make_move(random_move(state, rng))
+                    # explore a sibling and come back
+                    if state.winner == 'n':
+                        before = snapshot(state)
+                        state.make_move(random_move(state, rng))
+                        state.unmake_move()
+                        self.assertEqual(snapshot(state), before)
+                while len(snapshots) > 0:
+                    state.unmake_move()
+                    self.assertEqual(snapshot(state), snapshots.pop())
+                self.assertEqual(len(state.history), 0)
+
+    def test_invalid_move(self):
+        state = GameState(Game(), BitBoard)
+        state.make_move(Placement(2, 2, False))
+        before = snapshot(state)
+        with self.assertRaises(OccupiedException):
+            state.make_move(Placement(2, 2, False))
+        self.assertEqual(snapshot(state), before)
+        self.assertEqual(len(state.history), 1)
@@ -0,0 +1,62 @@
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from ..models import Game, MatchResult
+from ..game_state import GameState
+from ..strategies import Strategy, RandomStrategy, MonteCarloStrategy, play_match
+
+class MatchesTestCase(TestCase):
+    def test_abstract_strategy(self):
+        class NoChoice(Strategy):
+            pass
+
+        with self.assertRaises(TypeError):
+            NoChoice(0)
+
+    def test_play_match(self):
+        (winner, n_plies, moves) = play_match(RandomStrategy(0), RandomStrategy(1), with_moves=True)
+        self.assertIn(winner, ['1', '2'])
+        self.assertEqual(len(moves), n_plies)
+        self.assertEqual(play_match(RandomStrategy(0), RandomStrategy(1)), (winner, n_plies, None))
+
+        # the moves can be replayed
+        state = GameState(Game())
+        for move in moves:
+            if 'units' in move:
+                state.promote([p.units for p in state.promotions].index(
+                    [tuple(u) for u in move['units']]
+                ))
+                state.is_p1_turn = not state.is_p1_turn
+            else:
+                state.play(move['x'], move['y'], move['is_cat'])
+        self.assertEqual(state.winner, winner)
+
+    def test_max_plies(self):
+        (winner, n_plies, moves) = play_match(RandomStrategy(0), RandomStrategy(1), max_plies=5)
+        self.assertEqual(winner, 'n')
+        self.assertEqual(n_plies, 5)
+
+    def test_command(self):
+        for workers in (1, 2):
+            out = StringIO()
+            call_command('play_matches', 'random', 'random', games=6, workers=workers, stdout=out)
+            self.assertIn('6 games', out.getvalue())
+        self.assertEqual(MatchResult.objects.count(), 12)
+        self.assertFalse(MatchResult.objects.filter(moves__isnull=False).exists())
+
+        call_command('play_matches', 'random', 'random', games=3, workers=1, moves=True, batch_size=2, stdout=StringIO())
+        self.assertEqual(MatchResult.objects.filter(moves__isnull=False).count(), 3)
+
+    def test_command_mcts(self):
+        out = StringIO()
+        with mock.patch.object(MonteCarloStrategy, 'close', autospec=True) as close:
+            call_command(
+                'play_matches', 'mcts', 'random',
+                games=2, workers=1, max_plies=6, simulations=10, mcts_workers=1, stdout=out,
+            )
+        # every strategy is closed after its game
+        self.assertEqual(close.call_count, 2)
+        self.assertIn('game 0: mcts', out.getvalue())
+        self.assertIn('game 1: mcts', out.getvalue())
+        self.assertIn('nodes/s', out.getvalue())
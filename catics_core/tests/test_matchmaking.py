@@ -0,0 +1,94 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from ..models import Agent, AgentVersion, Game, Move, GameSnapshot, Rating
+from ..matchmaking import MatchScheduler, latest_versions, create_games, agent_games
+from .helpers import PASSWORD
+from .test_runtime import load_agent
+
+User = get_user_model()
+
+class MatchmakingTestCase(TestCase):
+    def setUp(self):
+        self.owners = [
+            User.objects.create_user(
+                username='owner{}'.format(i),
+                email='owner{}@catics.fr'.format(i),
+                password=PASSWORD,
+            )
+            for i in range(2)
+        ]
+        self.versions = []
+        for (i, owner) in enumerate([self.owners[0], self.owners[0], self.owners[1]]):
+            agent = Agent.objects.create(owner=owner, name='agent{}'.format(i))
+            AgentVersion.objects.create(agent=agent, number=0, wasm=load_agent('occupied'))
+            self.versions.append(
+                AgentVersion.objects.create(agent=agent, number=1, wasm=load_agent('first_square'))
+            )
+        self.executor = ThreadPoolExecutor(2)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_latest_versions(self):
+        self.assertEqual([v.id for v in latest_versions()], [v.id for v in self.versions])
+
+    def test_create_games(self):
+        rng = random.Random(0)
+        games = create_games(3, rng)
+        pairs = { frozenset((g.player1_id, g.player2_id)) for g in games }
+        self.assertEqual(len(pairs), 3)
+        # every pair played once, the sides are swapped
+        for game in create_games(3, rng):
+            swapped = agent_games().filter(player1_id=game.player2_id, player2_id=game.player1_id)
+            self.assertTrue(swapped.exists())
+        self.assertEqual(agent_games().count(), 6)
+
+    @override_settings(GAME_SNAPSHOT_INTERVAL=4)
+    def test_play(self):
+        scheduler = MatchScheduler(self.executor, 2, batch_size=2, max_plies=100)
+        n_games = 0
+        while n_games < 6:
+            n_games += scheduler.step()
+            self.assertLessEqual(len(scheduler.running), 2)
+        scheduler.flush()
+        self.assertEqual(scheduler.errors, [])
+        for game in Game.objects.exclude(winner='n'):
+            self.assertEqual(Move.objects.filter(game=game).count(), game.ply)
+            self.assertEqual(GameSnapshot.objects.filter(game=game).count(), game.ply // 4)
+            self.assertGreater(game.version, 0)
+        n_unfinished = Game.objects.filter(winner='n', ply=100).count()
+        n_finished = Game.objects.exclude(winner='n').count()
+        self.assertGreaterEqual(n_finished + n_unfinished, 6)
+        self.assertEqual(sum(r.n_games for r in Rating.objects.all()), 2 * n_finished)
+
+    def test_owner_limit(self):
+        scheduler = MatchScheduler(self.executor, 2, owner_limit=1)
+        scheduler.refill()
+        # 3 agents: 3 pairs
+        self.assertEqual(len(scheduler.queue), 3)
+        scheduler.submit()
+        # every game involves the first owner
+        self.assertEqual(len(scheduler.running), 1)
+        self.assertEqual(scheduler.owners[self.owners[0].id], 1)
+        scheduler.collect(None)
+        self.assertEqual(scheduler.owners[self.owners[0].id], 0)
+
+    def test_failed(self):
+        agent = Agent.objects.create(owner=self.owners[1], name='failing')
+        failing = AgentVersion.objects.create(agent=agent, wasm=load_agent('occupied'))
+        game = Game(
+            player1_object=self.versions[0],
+            player2_object=failing,
+            ply=1,
+            is_p1_turn=False,
+            n_kittens_p1=7,
+        )
+        # occupied plays on (0, 0) again
+        game.board = { 0: { 0: [True, False] } }
+        game.save()
+        scheduler = MatchScheduler(self.executor, 1)
+        # the oldest game is played first, then saved since nothing else runs
+        self.assertEqual(scheduler.step(), 1)
+        game.refresh_from_db()
+        self.assertEqual(game.winner, '1')
+        self.assertEqual(scheduler.errors[0][0], game.id)
@@ -0,0 +1,47 @@
+from django.test import TestCase
+from ..models import Game
+from ..game_state import GameState, BitBoard, Placement
+from ..game_state.promotions import Promotion
+from ..strategies import MonteCarloStrategy, RandomStrategy, STRATEGIES, play_match
+from ..strategies.mcts import search
+
+class MonteCarloTestCase(TestCase):
+    def test_search(self):
+        state = GameState(Game(), BitBoard)
+        hash = state.hash
+        (children, n_plies) = search(state, 100, 0)
+        self.assertEqual(sum(n for (n, _) in children.values()), 100)
+        self.assertGreater(n_plies, 100)
+        self.assertEqual(state.hash, hash)
+        self.assertEqual(state.history, [])
+        self.assertEqual(search(state, 100, 0), (children, n_plies))
+
+    def test_immediate_win(self):
+        game = Game(n_kittens_p1=4, n_cats_p1=2, n_kittens_p2=7)
+        game.board = { 0: { 0: [True, True] }, 1: { 0: [True, True] }, 5: { 5: [False, False] } }
+        state = GameState(game, BitBoard)
+        self.assertEqual(MonteCarloStrategy(n_simulations=300).choose(state), Placement(2, 0, True))
+
+    def test_workers(self):
+        state = GameState(Game(), BitBoard)
+        strategy = MonteCarloStrategy(n_simulations=20, workers=2)
+        try:
+            move = strategy.choose(state)
+        finally:
+            strategy.close()
+        self.assertIn(move, list(state.legal_moves()))
+        self.assertGreater(strategy.nodes_per_second, 0)
+
+    def test_against_random(self):
+        (winner, _, _) = play_match(RandomStrategy(1), MonteCarloStrategy(1, n_simulations=50), max_plies=200)
+        self.assertEqual(winner, '2')
+        self.assertIs(STRATEGIES['mcts'], MonteCarloStrategy)
+
+    def test_promotions_equality(self):
+        # the trees of the workers are merged by move
+        self.assertEqual(Promotion([(0, 0), (1, 0), (2, 0)]), Promotion([[0, 0], [1, 0], [2, 0]]))
+        self.assertEqual(
+            hash(Promotion([(0, 0), (1, 0), (2, 0)])),
+            hash(Promotion([[0, 0], [1, 0], [2, 0]])),
+        )
+        self.assertNotEqual(Promotion([(0, 0)]), Promotion([(1, 0)]))
@@ -0,0 +1,80 @@
+import random
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from ..models import Game, Move, GameSnapshot
+from ..game_state import GameState, BitBoard, Placement
+from .helpers import two_players_setup, random_move
+
+class MovesTestCase(APITestCase):
+    def setUp(self):
+        two_players_setup(self)
+
+    def test_views(self):
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.token2)
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 2, 'y': 2, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.ply, 2)
+        moves = list(Move.objects.filter(game=self.game).order_by('ply'))
+        self.assertEqual([(m.ply, m.x, m.y, m.is_cat) for m in moves], [(1, 3, 3, False), (2, 2, 2, False)])
+        self.assertEqual(GameState.load(self.game, 2).board.value(), self.game.board)
+        self.assertEqual(len(GameState.load(self.game, 1).board), 1)
+
+    def test_promotion_view(self):
+        # kittens cannot push the cats, two lines through (2, 0)
+        self.game.board = {
+            0: { 0: [True, True] },
+            1: { 0: [True, True] },
+            2: { 1: [True, True], 2: [True, True] },
+        }
+        self.game.save()
+        self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 2, 'y': 0, 'is_cat': False },
+        )
+        response = self.client.post(
+            reverse('core-promote'),
+            { 'game': self.game.id, 'units': [ [0, 0], [1, 0], [2, 0] ] },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        move = Move.objects.get(game=self.game, ply=2)
+        self.assertEqual(move.promotion, [ [0, 0], [1, 0], [2, 0] ])
+        self.assertIsNone(move.x)
+
+    @override_settings(GAME_SNAPSHOT_INTERVAL=4)
+    def test_load(self):
+        rng = random.Random(0)
+        game = Game.objects.create(player1_object=self.player1, player2_object=self.player2)
+        state = GameState(game, BitBoard)
+        values = [state.board.value()]
+        while state.winner == 'n':
+            move = random_move(state, rng)
+            if isinstance(move, Placement):
+                state.play(move.x, move.y, move.is_cat)
+                state.save()
+                state.save_move(x=move.x, y=move.y, is_cat=move.is_cat)
+            else:
+                state.choose_promotion(state.promotions.index(move))
+                state.save()
+                state.save_move(promotion=[list(u) for u in move.units])
+            values.append(state.board.value())
+
+        game.refresh_from_db()
+        self.assertEqual(game.ply, len(values) - 1)
+        self.assertEqual(GameSnapshot.objects.filter(game=game).count(), game.ply // 4)
+        for (ply, value) in enumerate(values):
+            loaded = GameState.load(game, ply, BitBoard)
+            self.assertEqual(loaded.ply, ply)
+            self.assertEqual(loaded.board.value(), value)
+        self.assertEqual(GameState.load(game, game.ply).winner, state.winner)
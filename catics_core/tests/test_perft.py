@@ -0,0 +1,60 @@
+import random
+from django.test import SimpleTestCase
+from ..models import Game
+from ..game_state import GameState, Board, BitBoard, Placement
+from ..game_state.perft import perft, divide
+from .helpers import random_move
+
+class PerftTestCase(SimpleTestCase):
+    def test_empty_board(self):
+        for board_class in (Board, BitBoard):
+            state = GameState(Game(), board_class)
+            self.assertEqual(perft(state, 1), 36)
+            self.assertEqual(perft(state, 2), 36 * 35)
+            # some kittens fall off the board after a push
+            self.assertEqual(perft(state, 3), 42900)
+            self.assertEqual(len(state.history), 0)
+
+    def test_divide(self):
+        state = GameState(Game(), BitBoard)
+        result = divide(state, 2)
+        self.assertEqual(len(result), 36)
+        self.assertEqual(result['00k'], 35)
+        self.assertEqual(sum(result.values()), perft(state, 2))
+
+    def test_same_boards(self):
+        rng = random.Random(0)
+        for _ in range(5):
+            states = [GameState(Game(), Board), GameState(Game(), BitBoard)]
+            for _ in range(rng.randrange(10, 30)):
+                move = random_move(states[0], rng)
+                if states[0].winner != 'n':
+                    break
+                states[0].make_move(move)
+                if isinstance(move, Placement):
+                    states[1].make_move(move)
+                else:
+                    # the promotions are not in the same order
+                    units = sorted(move.units)
+                    states[1].make_move(next(
+                        p for p in states[1].promotions if sorted(p.units) == units
+                    ))
+            self.assertEqual(perft(states[0], 2), perft(states[1], 2))
+
+    def test_promotions(self):
+        # kittens cannot push the cats, two lines through (2, 0)
+        state = GameState(Game(board={
+            0: { 0: [True, True] },
+            1: { 0: [True, True] },
+            2: { 1: [True, True], 2: [True, True] },
+        }))
+        state.play(2, 0, False)
+        self.assertTrue(state.is_p1_turn)
+        moves = list(state.legal_moves())
+        self.assertEqual(len(moves), 2)
+        self.assertEqual(moves, state.promotions)
+
+    def test_no_moves_after_win(self):
+        state = GameState(Game(winner='1'))
+        self.assertEqual(list(state.legal_moves()), [])
+        self.assertEqual(perft(state, 3), 1)
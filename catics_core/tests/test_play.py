@@ -3,7 +3,10 @@ from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from catics_auth.models import Validation
+from ..models import Game, Move
 from ..game_state import GameState, Board, Position
+from ..game_state.exceptions import ConflictException
+from ..views.play import play
 from .helpers import two_players_setup, all_units, PASSWORD
 
 User = get_user_model()
@@ -25,7 +28,7 @@ class PlayTestCase(APITestCase):
         self.assertEqual(len(board), 0)
 
     def test_unvalidated(self):
-        Validation.objects.filter(user=self.player1).update(is_validated=False)
+        User.objects.filter(id=self.player1.id).update(is_validated=False)
 
         response = self.client.post(
             reverse('core-play'),
@@ -1137,6 +1140,7 @@ class PlayTestCase(APITestCase):
             username='other',
             email='other@catics.fr',
             password=PASSWORD,
+            is_validated=True,
         )
         Validation.objects.create(
             user=other,
@@ -1161,3 +1165,42 @@ class PlayTestCase(APITestCase):
         board = Board(self.game.board)
         self.assertEqual(len(board), 0)
 
+
+    def test_concurrent(self):
+        # read by another request before this one saved
+        stale = Game.objects.get(id=self.game.id)
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertRaises(ConflictException) as context:
+            play(stale, self.player1, 0, 0, False)
+        self.assertEqual(context.exception.status_code, 409)
+
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.version, 1)
+        self.assertEqual(self.game.board, { 3: { 3: [True, False] } })
+        self.assertEqual(Move.objects.filter(game=self.game).count(), 1)
+
+    def test_response(self):
+        response = self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'ply': 1,
+            'board': { 3: { 3: [True, False] } },
+            'n_kittens_p1': 7,
+            'n_cats_p1': 0,
+            'n_kittens_p2': 8,
+            'n_cats_p2': 0,
+            'is_p1_turn': False,
+        })
+        # same as GameView, without the players
+        expected = self.client.get(reverse('core-game'), { 'id': self.game.id })
+        self.assertEqual(response.headers['ETag'], expected.headers['ETag'])
+        for (key, value) in response.data.items():
+            self.assertEqual(expected.data[key], value)
@@ -59,7 +59,7 @@ class PromoteTestCase(APITestCase):
         self.assertEqual(len(board), 8)
 
     def test_unvalidated(self):
-        Validation.objects.filter(user=self.player1).update(is_validated=False)
+        User.objects.filter(id=self.player1.id).update(is_validated=False)
 
         self.double_lines_setup()
         response = self.client.post(
@@ -123,7 +123,7 @@ class PromoteTestCase(APITestCase):
             expire_at=timezone.now(),
             validation_code='',
         )
-        Validation.objects.filter(user=other).update(is_validated=True)
+        User.objects.filter(id=other.id).update(is_validated=True)
         response = self.client.post(
             reverse('auth-login'),
             { 'username': 'other', 'password': PASSWORD },
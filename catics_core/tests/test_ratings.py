@@ -0,0 +1,94 @@
+from io import StringIO
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from ..models import Agent, AgentVersion, Game, Rating
+from ..game_state import GameState
+from ..ratings import record_results
+from .helpers import two_players_setup, all_units
+
+User = get_user_model()
+
+def win(game: Game):
+    '''
+    player 1 gets three cats in a row
+    '''
+    game.n_cats_p1 += 8
+    game.n_kittens_p1 -= 8
+    game.n_cats_p2 += 8
+    game.n_kittens_p2 -= 8
+    all_units(game, True)
+
+class RatingsTestCase(APITestCase):
+    def setUp(self):
+        two_players_setup(self)
+        self.user_type = ContentType.objects.get_for_model(User)
+
+    def rating(self, user) -> Rating:
+        return Rating.objects.get(player_type=self.user_type, player_id=user.id)
+
+    def test_incremental(self):
+        win(self.game)
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.winner, '1')
+        self.assertIsNotNone(self.game.finished_at)
+        rating1 = self.rating(self.player1)
+        rating2 = self.rating(self.player2)
+        self.assertEqual(rating1.rating, settings.RATING_INITIAL + settings.RATING_K / 2)
+        self.assertEqual(rating2.rating, settings.RATING_INITIAL - settings.RATING_K / 2)
+        self.assertEqual((rating1.n_games, rating1.n_wins), (1, 1))
+        self.assertEqual((rating2.n_games, rating2.n_wins), (1, 0))
+
+        # saved again: counted once
+        state = GameState(self.game)
+        state.save()
+        self.assertEqual(self.rating(self.player1).n_games, 1)
+
+        # the favorite gains less
+        win(Game.objects.create(player1_object=self.player1, player2_object=self.player2))
+        gain = self.rating(self.player1).rating - rating1.rating
+        self.assertGreater(gain, 0)
+        self.assertLess(gain, settings.RATING_K / 2)
+
+    def test_not_rated(self):
+        win(Game.objects.create(player1_object=self.player1, player2_object=self.player1))
+        self.assertFalse(Rating.objects.exists())
+        record_results([(((None, None), (None, None)), '1')])
+        self.assertFalse(Rating.objects.exists())
+
+    def test_recompute(self):
+        for _ in range(3):
+            win(Game.objects.create(player1_object=self.player1, player2_object=self.player2))
+        win(Game.objects.create(player1_object=self.player2, player2_object=self.player1))
+        expected = { (r.player_id, r.rating, r.n_games, r.n_wins) for r in Rating.objects.all() }
+        Rating.objects.update(rating=0)
+        out = StringIO()
+        call_command('recompute_ratings', chunk_size=2, stdout=out)
+        self.assertEqual({ (r.player_id, r.rating, r.n_games, r.n_wins) for r in Rating.objects.all() }, expected)
+        self.assertIn('2 players rated from 4 games', out.getvalue())
+
+    def test_leaderboard(self):
+        win(self.game)
+        response = self.client.get(reverse('core-leaderboard'), { 'players': 'users' })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['user'] for p in response.data], ['player1', 'player2'])
+        self.assertEqual(response.data[0]['rank'], 1)
+        self.assertEqual(response.data[0]['rating'], round(settings.RATING_INITIAL + settings.RATING_K / 2))
+
+        response = self.client.get(reverse('core-leaderboard'), { 'players': 'users', 'n': 1 })
+        self.assertEqual(len(response.data), 1)
+        response = self.client.get(reverse('core-leaderboard'), { 'n': settings.LEADERBOARD_MAX_SIZE + 1 })
+        self.assertEqual(response.status_code, 400)
+
+        agent = Agent.objects.create(owner=self.player1, name='agent')
+        versions = [AgentVersion.objects.create(agent=agent, number=i, wasm=b'') for i in range(2)]
+        version_type = ContentType.objects.get_for_model(AgentVersion)
+        record_results([(((version_type.id, versions[0].id), (version_type.id, versions[1].id)), '2')])
+        response = self.client.get(reverse('core-leaderboard'))
+        self.assertEqual(
+            [(p['agent'], p['agent_version']) for p in response.data],
+            [('agent', 1), ('agent', 0)],
+        )
@@ -0,0 +1,88 @@
+import os
+import wasmtime
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from ..models import Agent, AgentVersion, Game
+from ..game_state import GameState, BitBoard, Placement
+from ..runtime import WasmRuntime
+from ..runtime.exceptions import AgentFailedException, AgentInvalidMoveException
+from ..strategies import WasmStrategy, RandomStrategy, play_match
+from .helpers import PASSWORD
+
+User = get_user_model()
+
+def load_agent(name: str) -> bytes:
+    path = os.path.join(os.path.dirname(__file__), 'agents', name + '.wat')
+    with open(path, 'r') as f:
+        return wasmtime.wat2wasm(f.read())
+
+class RuntimeTestCase(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@catics.fr', password=PASSWORD)
+        self.agent = Agent.objects.create(owner=owner, name='agent')
+        self.runtime = WasmRuntime(fuel=1_000_000, time_limit=0.5, pool_size=2)
+        self.addCleanup(self.runtime.close)
+
+    def version(self, name: str) -> AgentVersion:
+        return AgentVersion.objects.create(agent=self.agent, wasm=load_agent(name))
+
+    def test_choose(self):
+        version = self.version('first_square')
+        state = GameState(Game(), BitBoard)
+        self.assertEqual(self.runtime.choose(version, state), Placement(0, 0, False))
+        state.make_move(Placement(0, 0, False))
+        self.assertEqual(self.runtime.choose(version, state), Placement(0, 1, False))
+
+    def test_cache(self):
+        version = self.version('first_square')
+        state = GameState(Game(), BitBoard)
+        for _ in range(5):
+            self.runtime.choose(version, state)
+        self.assertEqual(len(self.runtime.modules), 1)
+        self.assertEqual(len(self.runtime.pools[(version.id, version.updated_at)]), 1)
+
+    def test_evicted(self):
+        runtime = WasmRuntime(fuel=1_000_000, time_limit=0.5, cache_size=1)
+        self.addCleanup(runtime.close)
+        (first, second) = (self.version('first_square'), self.version('first_square'))
+        state = GameState(Game(), BitBoard)
+        with runtime.agent(first):
+            # evicts the module of the first one while its instance is used
+            runtime.choose(second, state)
+        self.assertEqual(list(runtime.modules), [(second.id, second.updated_at)])
+        # the instance of the evicted module is not pooled again
+        self.assertEqual(list(runtime.pools), [(second.id, second.updated_at)])
+
+    def test_match(self):
+        (winner, n_plies, _) = play_match(WasmStrategy(self.version('first_square')), RandomStrategy(0))
+        self.assertIn(winner, ['1', '2'])
+
+    def test_fuel(self):
+        version = self.version('infinite_loop')
+        with self.assertRaises(AgentFailedException):
+            self.runtime.choose(version, GameState(Game()))
+        # the failing instance is dropped
+        self.assertEqual(self.runtime.pools.get((version.id, version.updated_at), []), [])
+
+    def test_time_limit(self):
+        runtime = WasmRuntime(fuel=10 ** 15, time_limit=0.05)
+        self.addCleanup(runtime.close)
+        with self.assertRaises(AgentFailedException):
+            runtime.choose(self.version('infinite_loop'), GameState(Game()))
+
+    def test_memory(self):
+        with self.assertRaises(AgentFailedException):
+            self.runtime.choose(self.version('memory_hog'), GameState(Game()))
+
+    def test_invalid_move(self):
+        version = self.version('occupied')
+        state = GameState(Game(), BitBoard)
+        self.assertEqual(self.runtime.choose(version, state), Placement(0, 0, False))
+        state.make_move(Placement(0, 0, False))
+        with self.assertRaises(AgentInvalidMoveException):
+            self.runtime.choose(version, state)
+
+    def test_invalid_module(self):
+        version = AgentVersion.objects.create(agent=self.agent, wasm=b'not wasm')
+        with self.assertRaises(AgentFailedException):
+            self.runtime.choose(version, GameState(Game()))
@@ -0,0 +1,101 @@
+from unittest import mock
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.urls import reverse
+from rest_framework.test import APITransactionTestCase
+from catics.asgi import application
+from .helpers import two_players_setup
+
+class SocketsTestCase(APITransactionTestCase):
+    def setUp(self):
+        two_players_setup(self)
+
+    async def connect(self, token: str | None) -> WebsocketCommunicator:
+        headers = [] if token is None else [(b'authorization', ('Token ' + token).encode())]
+        communicator = WebsocketCommunicator(
+            application,
+            '/game/{}/ws/'.format(self.game.id),
+            headers=headers,
+        )
+        (connected, _) = await communicator.connect()
+        self.assertTrue(connected)
+        message = await communicator.receive_json_from()
+        self.assertEqual(message['type'], 'game')
+        self.assertEqual(message['game']['ply'], 0)
+        return communicator
+
+    async def test_unauthenticated(self):
+        communicator = WebsocketCommunicator(application, '/game/{}/ws/'.format(self.game.id))
+        (connected, _) = await communicator.connect()
+        self.assertFalse(connected)
+        communicator = WebsocketCommunicator(
+            application,
+            '/game/{}/ws/'.format(self.game.id),
+            headers=[(b'authorization', b'Token wrong')],
+        )
+        (connected, _) = await communicator.connect()
+        self.assertFalse(connected)
+
+    async def test_play(self):
+        communicator1 = await self.connect(self.token1)
+        communicator2 = await self.connect(self.token2)
+
+        await communicator1.send_json_to({ 'type': 'play', 'x': 3, 'y': 3, 'is_cat': False })
+        for communicator in (communicator1, communicator2):
+            message = await communicator.receive_json_from()
+            self.assertEqual(message['type'], 'diff')
+            self.assertEqual(message['diff']['ply'], 1)
+            self.assertEqual(message['diff']['squares'], [[3, 3, [True, False]]])
+            self.assertEqual(message['diff']['n_kittens_p1'], 7)
+            self.assertFalse(message['diff']['is_p1_turn'])
+
+        # pushed kitten
+        await communicator2.send_json_to({ 'type': 'play', 'x': 2, 'y': 2, 'is_cat': False })
+        message = await communicator1.receive_json_from()
+        self.assertEqual(message['diff']['squares'], [[2, 2, [False, False]], [3, 3, None], [4, 4, [True, False]]])
+
+        await communicator1.disconnect()
+        await communicator2.disconnect()
+
+    def test_unreachable_layer(self):
+        channel_layer = mock.Mock()
+        channel_layer.group_send = mock.AsyncMock(side_effect=OSError('unreachable'))
+        with mock.patch('catics_core.broadcast.get_channel_layer', return_value=channel_layer), \
+                self.assertLogs('catics_core.broadcast', 'ERROR'):
+            response = self.client.post(
+                reverse('core-play'),
+                { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+            )
+        # the move is committed, only its diff is lost
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ply'], 1)
+        channel_layer.group_send.assert_called_once()
+
+    async def test_errors(self):
+        communicator = await self.connect(self.token2)
+
+        await communicator.send_json_to({ 'type': 'play', 'x': 3, 'y': 3, 'is_cat': False })
+        message = await communicator.receive_json_from()
+        self.assertEqual(message['type'], 'error')
+        self.assertEqual(message['error']['code'], 'not_your_turn')
+
+        await communicator.send_json_to({ 'type': 'play', 'x': 6, 'y': 3, 'is_cat': False })
+        message = await communicator.receive_json_from()
+        self.assertIn('x', message['error'])
+
+        await communicator.send_json_to({ 'type': 'resign' })
+        message = await communicator.receive_json_from()
+        self.assertIn('type', message['error'])
+
+        await communicator.disconnect()
+
+    async def test_http_move(self):
+        communicator = await self.connect(self.token2)
+        response = await sync_to_async(self.client.post)(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 0, 'y': 0, 'is_cat': False },
+        )
+        self.assertEqual(response.status_code, 200)
+        message = await communicator.receive_json_from()
+        self.assertEqual(message['diff']['squares'], [[0, 0, [True, False]]])
+        await communicator.disconnect()
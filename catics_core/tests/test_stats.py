@@ -0,0 +1,71 @@
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from ..models import Game
+from ..stats import RequestSample, RequestStats, percentile, request_stats
+from .helpers import two_players_setup
+
+class StatsTestCase(APITestCase):
+    def setUp(self):
+        two_players_setup(self)
+        request_stats.clear()
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 51)
+        self.assertEqual(percentile(values, 99), 100)
+        self.assertEqual(percentile(values, 100), 100)
+        self.assertEqual(percentile([], 50), 0)
+
+    def test_ring_buffer(self):
+        stats = RequestStats(3)
+        for n in range(5):
+            stats.add(RequestSample('GET core-game', n, 0, 0))
+        stats.add(RequestSample('POST core-play', 7, 0.5, 1))
+        result = stats.percentiles((0, 100))
+        self.assertEqual(result['GET core-game'], {
+            'count': 2,
+            'n_queries': [3, 4],
+            'db_time': [0, 0],
+            'python_time': [0, 0],
+            'wait_time': [0, 0],
+        })
+        self.assertEqual(result['POST core-play']['n_queries'], [7, 7])
+
+    def test_middleware(self):
+        self.client.get(reverse('core-game'), { 'id': self.game.id })
+        self.client.post(
+            reverse('core-play'),
+            { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+        )
+        self.client.get('/nowhere/')
+        samples = list(request_stats.samples)
+        # the login requests of the setup were cleared
+        self.assertEqual(
+            [s.endpoint for s in samples],
+            ['GET core-game', 'POST core-play', 'GET unresolved'],
+        )
+        self.assertGreater(samples[1].n_queries, 0)
+        self.assertGreater(samples[1].db_time, 0)
+        self.assertGreater(samples[1].python_time, 0)
+
+    @override_settings(GAME_WAIT_TIMEOUT=timedelta(seconds=0.2), GAME_WAIT_POLL=timedelta(seconds=0.1))
+    def test_wait_time(self):
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        self.assertEqual(response.status_code, 204)
+        sample = request_stats.samples[-1]
+        self.assertEqual(sample.endpoint, 'GET core-game-wait')
+        # the long polling is not python time
+        self.assertGreaterEqual(sample.wait_time, 0.15)
+        self.assertLess(sample.python_time, 0.1)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('request_stats', games=1, max_plies=10, stdout=out)
+        self.assertIn('POST core-play', out.getvalue())
+        self.assertIn('wait ms', out.getvalue())
+        # nothing saved
+        self.assertEqual(Game.objects.count(), 1)
@@ -0,0 +1,80 @@
+import threading
+from datetime import timedelta
+from time import monotonic
+from django.urls import reverse
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from ..notifier import GameNotifier, notifier
+from .helpers import two_players_setup
+
+class WaitTestCase(APITestCase):
+    def setUp(self):
+        two_players_setup(self)
+
+    def test_already_changed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('core-play'),
+                { 'game': self.game.id, 'x': 3, 'y': 3, 'is_cat': False },
+            )
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['ply'], 1)
+        self.assertEqual(response.data['board'], { 3: { 3: [True, False] } })
+        self.assertFalse(response.data['is_p1_turn'])
+
+    @override_settings(GAME_WAIT_TIMEOUT=timedelta(seconds=0.1), GAME_WAIT_POLL=timedelta(seconds=0.05))
+    def test_timeout(self):
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        self.assertEqual(response.status_code, 204)
+
+    @override_settings(GAME_WAIT_TIMEOUT=timedelta(seconds=10), GAME_WAIT_POLL=timedelta(seconds=10))
+    def test_notified(self):
+        timer = threading.Timer(0.1, notifier.notify, (self.game.id, 1))
+        start = monotonic()
+        timer.start()
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        timer.join()
+        self.assertEqual(response.status_code, 200)
+        self.assertLess(monotonic() - start, 5)
+
+    @override_settings(GAME_WAIT_MAX_WAITERS=0)
+    def test_busy(self):
+        start = monotonic()
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        self.assertEqual(response.status_code, 204)
+        self.assertIn('Retry-After', response.headers)
+        self.assertLess(monotonic() - start, 1)
+
+    @override_settings(GAME_WAIT_TIMEOUT=timedelta(seconds=0.1), GAME_WAIT_POLL=timedelta(seconds=0.05))
+    def test_released(self):
+        for _ in range(3):
+            self.client.get(reverse('core-game-wait'), { 'id': self.game.id, 'ply': 0 })
+        self.assertEqual(notifier.n_reserved, 0)
+
+    def test_invalid(self):
+        response = self.client.get(reverse('core-game-wait'), { 'id': self.game.id })
+        self.assertEqual(response.status_code, 400)
+
+class GameNotifierTestCase(APITestCase):
+    def test_nobody_waiting(self):
+        notifier = GameNotifier()
+        notifier.notify(1, 3)
+        self.assertEqual(notifier.plies, {})
+        self.assertFalse(notifier.wait(1, 0, 0.01))
+        self.assertEqual(notifier.waiting, {})
+
+    def test_reserve(self):
+        notifier = GameNotifier()
+        self.assertTrue(notifier.reserve(1))
+        self.assertFalse(notifier.reserve(1))
+        notifier.release()
+        self.assertTrue(notifier.reserve(1))
+
+    def test_older_ply(self):
+        notifier = GameNotifier()
+        timer = threading.Timer(0.05, notifier.notify, (1, 3))
+        timer.start()
+        self.assertFalse(notifier.wait(1, 3, 0.2))
+        timer.join()
+        self.assertEqual(notifier.plies, {})
@@ -0,0 +1,52 @@
+import random
+from django.test import SimpleTestCase
+from ..models import Game
+from ..game_state import GameState, Board, BitBoard, Position
+from ..game_state.opportunities import scan_promotions
+from ..game_state.windows import WINDOWS
+from ..management.commands.bench_promotions import random_board
+from .helpers import play_random_move
+
+class WindowsTestCase(SimpleTestCase):
+    def test_count(self):
+        # 6 * 4 columns, 6 * 4 lines, 2 * 4 * 4 diagonals
+        self.assertEqual(len(WINDOWS), 80)
+        self.assertEqual(len(set(frozenset(w) for w in WINDOWS)), 80)
+
+    def test_same_as_scanners(self):
+        rng = random.Random(0)
+        for _ in range(500):
+            value = random_board(rng, rng.randint(0, 20))
+            board = Board(value)
+            bit_board = BitBoard(value)
+            for is_player1 in (True, False):
+                expected = [p.units for p in scan_promotions(board, is_player1)]
+                self.assertEqual([p.units for p in board.look_for_promotions(is_player1)], expected)
+                self.assertEqual([p.units for p in bit_board.look_for_promotions(is_player1)], expected)
+
+    def test_incremental(self):
+        rng = random.Random(1)
+        for board_class in (Board, BitBoard):
+            for _ in range(30):
+                state = GameState(Game(), board_class)
+                while state.winner == 'n':
+                    play_random_move(state, rng)
+                    reference = Board(state.board.value())
+                    for is_player1 in (True, False):
+                        self.assertEqual(
+                            [p.units for p in state.board.look_for_promotions(is_player1)],
+                            [p.units for p in scan_promotions(reference, is_player1)],
+                        )
+
+    def test_changes(self):
+        for board_class in (Board, BitBoard):
+            board = board_class({
+                2: { 2: [True, False], 4: [True, True] },
+                3: { 0: [False, False] },
+            })
+            changes = board.play(3, 1, Position(False, False))
+            self.assertEqual(changes.placed, (3, 1))
+            self.assertEqual(changes.moved, [((2, 2), (1, 3))])
+            self.assertEqual(changes.fallen, [((3, 0), Position(False, False))])
+            self.assertEqual(changes.fallen_counts.n_kittens_p2, 1)
+            self.assertEqual(sorted(changes.squares()), [(1, 3), (2, 2), (3, 0), (3, 1)])
@@ -0,0 +1,47 @@
+import random
+from django.test import SimpleTestCase
+from ..models import Game
+from ..game_state import GameState, Board, BitBoard
+from .helpers import random_move
+
+def reload(state: GameState, board_class: type) -> GameState:
+    return GameState(Game(
+        is_p1_turn=state.is_p1_turn,
+        n_kittens_p1=state.counts.n_kittens_p1,
+        n_cats_p1=state.counts.n_cats_p1,
+        n_kittens_p2=state.counts.n_kittens_p2,
+        n_cats_p2=state.counts.n_cats_p2,
+        board=state.board.value(),
+        promotions=[p.units for p in state.promotions],
+        winner=state.winner,
+    ), board_class)
+
+class ZobristTestCase(SimpleTestCase):
+    def test_incremental(self):
+        rng = random.Random(0)
+        for board_class in (Board, BitBoard):
+            for _ in range(20):
+                state = GameState(Game(), board_class)
+                hashes = []
+                while state.winner == 'n':
+                    hashes.append(state.hash)
+                    state.make_move(random_move(state, rng))
+                    self.assertEqual(state.hash, reload(state, Board).hash)
+                    self.assertEqual(state.hash, reload(state, BitBoard).hash)
+                while len(hashes) > 0:
+                    state.unmake_move()
+                    self.assertEqual(state.hash, hashes.pop())
+
+    def test_distinct(self):
+        state = GameState(Game(), BitBoard)
+        empty = state.hash
+        self.assertEqual(reload(state, Board).hash, empty)
+        state.is_p1_turn = False
+        self.assertNotEqual(state.hash, empty)
+        state.is_p1_turn = True
+        state.counts.n_kittens_p1 -= 1
+        self.assertNotEqual(state.hash, empty)
+        state.counts.n_kittens_p1 += 1
+        self.assertEqual(state.hash, empty)
+        self.assertGreaterEqual(empty, 0)
+        self.assertLess(empty, 1 << 64)
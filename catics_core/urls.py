@@ -3,6 +3,8 @@ from . import views
 
 urlpatterns = [
     path('game/', views.GameView.as_view(), name='core-game'),
+    path('game/wait/', views.GameWaitView.as_view(), name='core-game-wait'),
     path('play/', views.PlayView.as_view(), name='core-play'),
     path('promote/', views.PromoteView.as_view(), name='core-promote'),
+    path('leaderboard/', views.LeaderboardView.as_view(), name='core-leaderboard'),
 ]
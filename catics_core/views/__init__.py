@@ -1,3 +1,5 @@
 from .game import GameView
 from .play import PlayView
 from .promote import PromoteView
+from .wait import GameWaitView
+from .leaderboard import LeaderboardView
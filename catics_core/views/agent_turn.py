@@ -0,0 +1,44 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from ..broadcast import broadcast
+from ..game_state import GameState, Placement
+from ..models import AgentVersion
+from ..runtime.exceptions import AgentFailedException, AgentInvalidMoveException
+from ..strategies import WasmStrategy
+
+def play_agents(state: GameState) -> GameState:
+    '''
+    plays the moves of the agent of a game against a user while it is its turn, each one saved
+    like the moves of the users, an agent which cannot play loses,
+    the games between two agents are played by the matchmaking command
+    '''
+    agent_type_id = ContentType.objects.get_for_model(AgentVersion).id
+    strategies = {}
+    while state.winner == 'n':
+        (player_type_id, player_id) = state.players[not state.is_p1_turn]
+        if player_type_id != agent_type_id:
+            break
+        if player_id not in strategies:
+            strategies[player_id] = WasmStrategy(AgentVersion.objects.get(id=player_id))
+        try:
+            move = strategies[player_id].choose(state)
+        except (AgentFailedException, AgentInvalidMoveException):
+            state.winner = '2' if state.is_p1_turn else '1'
+            with transaction.atomic():
+                state.save()
+                transaction.on_commit(lambda: broadcast(state, []))
+            break
+
+        if isinstance(move, Placement):
+            changes = state.play(move.x, move.y, move.is_cat)
+            squares = changes.squares() + [square for (square, _) in changes.promoted]
+            values = { 'x': move.x, 'y': move.y, 'is_cat': move.is_cat }
+        else:
+            removed = state.choose_promotion(state.promotions.index(move))
+            squares = [square for (square, _) in removed]
+            values = { 'promotion': [list(u) for u in move.units] }
+        with transaction.atomic():
+            state.save()
+            state.save_move(**values)
+            transaction.on_commit(lambda squares=squares: broadcast(state, squares))
+    return state
@@ -14,3 +14,13 @@ class NotAPlayerException(APIException):
     status_code = 403
     default_code = 'not_a_player'
     default_detail = 'Vous n\'êtes pas un joueur de cette partie'
+
+class NotYourAgentException(APIException):
+    status_code = 403
+    default_code = 'not_your_agent'
+    default_detail = 'Cet agent ne vous appartient pas'
+
+class NoAgentVersionException(APIException):
+    status_code = 400
+    default_code = 'no_agent_version'
+    default_detail = 'Cet agent n\'a aucune version'
@@ -6,7 +6,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from knox.auth import TokenAuthentication
 from catics_auth.permissions import IsValidated
-from ..models import Game, Agent
+from ..models import Game, Agent, AgentVersion
+from ..game_state import GameState, BitBoard
+from .exceptions import NotYourAgentException, NoAgentVersionException
+from .agent_turn import play_agents
 
 User = get_user_model()
 
@@ -29,6 +32,32 @@ class GameCreateSerializer(serializers.Serializer):
 class GameGetSerializer(serializers.Serializer):
     id = serializers.PrimaryKeyRelatedField(queryset=Game.objects.all())
 
+def latest_version(agent: Agent) -> AgentVersion:
+    version = AgentVersion.objects.filter(agent=agent).order_by('-number', '-id').defer('wasm').first()
+    if version is None:
+        raise NoAgentVersionException()
+    return version
+
+def game_etag(game: Game | GameState) -> str:
+    return '"{}-{}"'.format(game.id, game.version)
+
+def agent_value(player: str, version_id: int) -> dict:
+    # not through the generic relation, it would load the module
+    version = AgentVersion.objects.select_related('agent').defer('wasm').get(id=version_id)
+    return { player + '_agent': version.agent.name, player + '_agent_version': version.number }
+
+def game_value(game: Game) -> dict:
+    result = GameState(game, BitBoard).value()
+    if game.player1_type.model == 'caticsuser':
+        result['player1_user'] = game.player1_object.username
+    else:
+        result.update(agent_value('player1', game.player1_id))
+    if game.player2_type.model == 'caticsuser':
+        result['player2_user'] = game.player2_object.username
+    else:
+        result.update(agent_value('player2', game.player2_id))
+    return result
+
 class GameView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, IsValidated]
@@ -38,30 +67,11 @@ class GameView(APIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=400)
         game = serializer.validated_data['id']
-        result = {
-            'board': game.board,
-            'n_kittens_p1': game.n_kittens_p1,
-            'n_cats_p1': game.n_cats_p1,
-            'n_kittens_p2': game.n_kittens_p2,
-            'n_cats_p2': game.n_cats_p2,
-        }
-        if len(game.promotions) > 0:
-            result['promotions'] = game.promotions
-        if game.winner == 'n':
-            result['is_p1_turn'] = game.is_p1_turn
-        else:
-            result['winner'] = game.winner
-        if game.player1_type.model == 'caticsuser':
-            result['player1_user'] = game.player1_object.username
-        else:
-            # TODO: agents
-            pass
-        if game.player2_type.model == 'caticsuser':
-            result['player2_user'] = game.player2_object.username
-        else:
-            # TODO: agents
-            pass
-        return Response(result)
+        etag = game_etag(game)
+        # unchanged: nothing to render, the players are not even fetched
+        if etag in (tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')):
+            return Response(status=304, headers={ 'ETag': etag })
+        return Response(game_value(game), headers={ 'ETag': etag })
 
     def put(self, request, format=None):
         serializer = GameCreateSerializer(data=request.data)
@@ -70,14 +80,17 @@ class GameView(APIView):
         data = serializer.validated_data
 
         if 'player1_agent' in data:
-            # TODO
-            pass
+            if data['player1_agent'].owner_id != request.user.id:
+                raise NotYourAgentException()
+            player1_object = latest_version(data['player1_agent'])
         else:
             player1_object = request.user
         if 'player2_agent' in data:
-            # TODO
-            pass
+            player2_object = latest_version(data['player2_agent'])
         else:
             player2_object = data['player2_user']
         game = Game.objects.create(player1_object=player1_object, player2_object=player2_object)
+        if 'player1_agent' in data and 'player2_agent' not in data:
+            # the agent moves first
+            play_agents(GameState(game, BitBoard))
         return Response({ 'id': game.id })
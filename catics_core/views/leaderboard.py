@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from knox.auth import TokenAuthentication
+from catics_auth.permissions import IsValidated
+from ..models import AgentVersion, Rating
+
+User = get_user_model()
+
+class LeaderboardSerializer(serializers.Serializer):
+    players = serializers.ChoiceField(choices=['users', 'agents'], default='agents')
+    n = serializers.IntegerField(min_value=1, max_value=settings.LEADERBOARD_MAX_SIZE, default=20)
+
+class LeaderboardView(APIView):
+    '''
+    the n best rated users or agent versions, read from the rating_leaderboard index
+    '''
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, IsValidated]
+
+    def get(self, request, format=None):
+        serializer = LeaderboardSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+        data = serializer.validated_data
+
+        is_users = data['players'] == 'users'
+        player_type = ContentType.objects.get_for_model(User if is_users else AgentVersion)
+        ratings = list(Rating.objects.filter(player_type=player_type).order_by('-rating')[:data['n']])
+        ids = [r.player_id for r in ratings]
+        if is_users:
+            names = { u.id: { 'user': u.username } for u in User.objects.filter(id__in=ids) }
+        else:
+            names = {
+                v.id: { 'agent': v.agent.name, 'agent_version': v.number }
+                for v in AgentVersion.objects.filter(id__in=ids).select_related('agent').defer('wasm')
+            }
+
+        result = []
+        for r in ratings:
+            # the player may have been deleted
+            if r.player_id not in names:
+                continue
+            result.append({
+                'rank': len(result) + 1,
+                **names[r.player_id],
+                'rating': round(r.rating),
+                'n_games': r.n_games,
+                'n_wins': r.n_wins,
+            })
+        return Response(result)
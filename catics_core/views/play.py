@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -5,7 +6,10 @@ from rest_framework.permissions import IsAuthenticated
 from knox.auth import TokenAuthentication
 from catics_auth.permissions import IsValidated
 from ..models import Game
-from ..game_state import GameState
+from ..broadcast import broadcast
+from ..game_state import GameState, BitBoard
+from .game import game_etag
+from .agent_turn import play_agents
 from .exceptions import NotYourTurnException, NotAPlayerException
 
 class PlaySerializer(serializers.Serializer):
@@ -14,6 +18,30 @@ class PlaySerializer(serializers.Serializer):
     y = serializers.IntegerField(min_value=0, max_value=5)
     is_cat = serializers.BooleanField()
 
+def play(game: Game, user, x: int, y: int, is_cat: bool) -> GameState:
+    '''
+    plays the move of this user and saves it, then the reply of the agent it plays against,
+    for PlayView and the game sockets
+    '''
+    # the id of an agent version is not the id of a user
+    is_player1 = game.player1_type.model == 'caticsuser' and user.id == game.player1_id
+    is_player2 = game.player2_type.model == 'caticsuser' and user.id == game.player2_id
+
+    if not is_player1 and not is_player2:
+        raise NotAPlayerException()
+
+    if is_player1 != game.is_p1_turn:
+        raise NotYourTurnException()
+
+    state = GameState(game, BitBoard)
+    changes = state.play(x, y, is_cat)
+    squares = changes.squares() + [square for (square, _) in changes.promoted]
+    with transaction.atomic():
+        state.save()
+        state.save_move(x=x, y=y, is_cat=is_cat)
+        transaction.on_commit(lambda: broadcast(state, squares))
+    return play_agents(state)
+
 class PlayView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, IsValidated]
@@ -24,18 +52,5 @@ class PlayView(APIView):
             return Response(serializer.errors, status=400)
         data = serializer.validated_data
 
-        is_player1 = request.user.id == data['game'].player1_id
-        is_player2 = request.user.id == data['game'].player2_id
-
-        if not is_player1 and not is_player2:
-            raise NotAPlayerException()
-            
-        if is_player1 != data['game'].is_p1_turn:
-            raise NotYourTurnException()
-
-        state = GameState(data['game'])
-        state.play(data['x'], data['y'], data['is_cat'])
-        state.save()
-        data['game'].refresh_from_db()
-        return Response({ 'board': data['game'].board })
-
+        state = play(data['game'], request.user, data['x'], data['y'], data['is_cat'])
+        return Response(state.value(), headers={ 'ETag': game_etag(state) })
@@ -1,11 +1,15 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from knox.auth import TokenAuthentication
 from catics_auth.permissions import IsValidated
-from ..game_state import GameState
+from ..broadcast import broadcast
+from ..game_state import GameState, BitBoard
 from ..models import Game
+from .game import game_etag
+from .agent_turn import play_agents
 from .exceptions import NotYourTurnException, InvalidUnitsException, NotAPlayerException
 
 class PromoteSerializer(serializers.Serializer):
@@ -18,6 +22,51 @@ class PromoteSerializer(serializers.Serializer):
         ),
     )
 
+def promote(game: Game, user, units: list[list[int]]) -> GameState:
+    '''
+    promotes the units chosen by this user and saves it, then the reply of the agent it plays
+    against, for PromoteView and the game sockets
+    '''
+    if game.is_p1_turn:
+        (current_model, opponent_model, current_player, opponent_player) = (
+            game.player1_type.model,
+            game.player2_type.model,
+            game.player1_id,
+            game.player2_id,
+        )
+    else:
+        (current_model, opponent_model, current_player, opponent_player) = (
+            game.player2_type.model,
+            game.player1_type.model,
+            game.player2_id,
+            game.player1_id,
+        )
+
+    # is the user the opponent ?
+    if opponent_model == 'caticsuser' and opponent_player == user.id:
+        raise NotYourTurnException()
+
+    # is the user the current player ?
+    if current_model != 'caticsuser' or current_player != user.id:
+        raise NotAPlayerException()
+
+    promotion_index = None
+    for (i, p) in enumerate(game.promotions):
+        if p == units:
+            promotion_index = i
+            break
+    if promotion_index is None:
+        raise InvalidUnitsException()
+
+    state = GameState(game, BitBoard)
+    removed = state.choose_promotion(promotion_index)
+    squares = [square for (square, _) in removed]
+    with transaction.atomic():
+        state.save()
+        state.save_move(promotion=units)
+        transaction.on_commit(lambda: broadcast(state, squares))
+    return play_agents(state)
+
 class PromoteView(APIView):
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated, IsValidated]
@@ -28,41 +77,5 @@ class PromoteView(APIView):
             return Response(serializer.errors, status=400)
         data = serializer.validated_data
 
-        if data['game'].is_p1_turn:
-            (current_model, opponent_model, current_player, opponent_player) = (
-                data['game'].player1_type.model,
-                data['game'].player2_type.model,
-                data['game'].player1_id,
-                data['game'].player2_id,
-            )
-        else:
-            (current_model, opponent_model, current_player, opponent_player) = (
-                data['game'].player2_type.model,
-                data['game'].player1_type.model,
-                data['game'].player2_id,
-                data['game'].player1_id,
-            )
-
-        # is the user the opponent ?
-        if opponent_model == 'caticsuser' and opponent_player == request.user.id:
-            raise NotYourTurnException()
-
-        # is the user the current player ?
-        if current_model != 'caticsuser' or current_player != request.user.id:
-            raise NotAPlayerException()
-
-        promotion_index = None
-        for (i, p) in enumerate(data['game'].promotions):
-            if p == data['units']:
-                promotion_index = i
-                break
-        if promotion_index is None:
-            raise InvalidUnitsException()
-
-        state = GameState(data['game'])
-        state.promote(promotion_index)
-        state.is_p1_turn = not state.is_p1_turn
-        state.save()
-
-        return Response({ 'board': state.board.value() })
-
+        state = promote(data['game'], request.user, data['units'])
+        return Response(state.value(), headers={ 'ETag': game_etag(state) })
@@ -0,0 +1,54 @@
+from time import monotonic
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from knox.auth import TokenAuthentication
+from catics_auth.permissions import IsValidated
+from ..models import Game
+from ..notifier import notifier
+from ..stats import waiting
+from .game import game_etag, game_value
+
+class GameWaitSerializer(serializers.Serializer):
+    id = serializers.PrimaryKeyRelatedField(queryset=Game.objects.all())
+    ply = serializers.IntegerField(min_value=0)
+
+class GameWaitView(APIView):
+    '''
+    long polling: answers as soon as the game is past the given ply,
+    or with a 204 when nothing happened before GAME_WAIT_TIMEOUT,
+    at once (with a Retry-After) when GAME_WAIT_MAX_WAITERS requests of this process already wait
+    '''
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, IsValidated]
+
+    def get(self, request, format=None):
+        serializer = GameWaitSerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=400)
+        game = serializer.validated_data['id']
+        ply = serializer.validated_data['ply']
+
+        if game.ply <= ply:
+            poll = settings.GAME_WAIT_POLL.total_seconds()
+            if not notifier.reserve(settings.GAME_WAIT_MAX_WAITERS):
+                return Response(status=204, headers={ 'Retry-After': str(round(poll)) })
+            try:
+                deadline = monotonic() + settings.GAME_WAIT_TIMEOUT.total_seconds()
+                while True:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        return Response(status=204)
+                    with waiting():
+                        changed = notifier.wait(game.id, ply, min(poll, remaining))
+                    if changed:
+                        break
+                    # only the ply is read while nothing changes
+                    if Game.objects.filter(id=game.id, ply__gt=ply).exists():
+                        break
+            finally:
+                notifier.release()
+            game.refresh_from_db()
+        return Response(game_value(game), headers={ 'ETag': game_etag(game) })
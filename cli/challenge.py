@@ -0,0 +1,48 @@
+import hashlib
+from collections import deque
+from multiprocessing import Pool
+from os import cpu_count
+from time import perf_counter
+
+CHUNK_SIZE = 1 << 16
+
+def leading_zeros(digest: bytes, n_hex_digits: int) -> bool:
+    '''
+    does the hexadecimal digest start with n_hex_digits zeros ?
+    '''
+    (n_bytes, odd) = divmod(n_hex_digits, 2)
+    return digest[:n_bytes] == bytes(n_bytes) and (not odd or digest[n_bytes] < 0x10)
+
+def solve_chunk(args: tuple[str, int, int]) -> tuple[str | None, int]:
+    '''
+    tries the answers start..start + CHUNK_SIZE, returns the first valid one and the number of tries
+    '''
+    (challenge, difficulty, start) = args
+    prefix = hashlib.sha256(challenge.encode())
+    for n in range(start, start + CHUNK_SIZE):
+        # the hash of the challenge is only computed once
+        h = prefix.copy()
+        h.update(b'%d' % n)
+        if leading_zeros(h.digest(), difficulty):
+            return (str(n), n - start + 1)
+    return (None, CHUNK_SIZE)
+
+def solve(challenge: str, difficulty: int, workers: int = cpu_count()) -> tuple[str, float]:
+    '''
+    the answer, the numbers are tried in order across all cores, and the hash rate
+    '''
+    start = perf_counter()
+    n_hashes = 0
+    with Pool(workers) as pool:
+        # a few chunks ahead of the one being checked, in order, so the answer is the smallest one
+        pending = deque()
+        next_start = 0
+        while True:
+            while len(pending) < 2 * workers:
+                pending.append(pool.apply_async(solve_chunk, ((challenge, difficulty, next_start),)))
+                next_start += CHUNK_SIZE
+            (answer, n) = pending.popleft().get()
+            n_hashes += n
+            if answer is not None:
+                break
+    return (answer, n_hashes / (perf_counter() - start))